@@ -0,0 +1,242 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.bitmaps:  Shared cache of bitmaps referenced by XRC files
+
+When wx loads a resource that contains bitmaps (for example the tools of a
+toolbar, or a wxBitmapButton) it decodes the image files again each time.
+This module keeps a single process-wide cache of decoded bitmaps, keyed by
+the path, requested size and modification time of the image file, so that
+each image is decoded only once however many windows use it.
+
+To make wx use the cache, the XRC data is rewritten before it is loaded:
+each bitmap parameter naming an existing file is given a "stock_id" of the
+form "xrcwidgets:<mtime>:<path>", which wx requests from an ArtProvider
+installed by this module.  XRCWidget does this automatically, and code
+generated by XRCWidgets.codegen uses getBitmap() directly; call the
+disable() function to load all bitmaps in the normal way.
+
+Rewritten data is loaded from memory, so for plain XRC files the names of
+bitmaps and of other files that the resource refers to (such as the url
+of a wxHtmlWindow) are made absolute, relative to the directory of the XRC
+file.  Files whose XRC data contains no bitmaps are loaded by name as
+usual.  Relative names in data from other locations, such as zip archives,
+do not name files that wx could load and are left unchanged.
+
+The modification time in a stock_id is fixed when the resource is loaded.
+Since loaded resources are cached, an image file that changes afterwards
+is only read again once the resource is loaded afresh, for example after
+XRCWidgets.memory.clearCaches().
+
+The cache is registered with XRCWidgets.memory under the name "bitmaps",
+and is limited to 32MB of bitmap data by default.
+
+"""
+
+import os
+import re
+from xml.sax.saxutils import escape, unescape, quoteattr
+
+import wx
+
+from XRCWidgets import memory
+from XRCWidgets.utils import LRUCache
+
+
+ART_PREFIX = "xrcwidgets:"
+
+# Names of XRC parameters that may give the file name of a bitmap
+_BITMAP_PARAMS = ("bitmap","bitmap2","icon","selected","focus","disabled",
+                  "hover","pressed","current")
+
+_bitmapParamRE = re.compile((r"<(%s)(\s[^>]*)?>([^<]*)</\1\s*>" %
+                             ("|".join(_BITMAP_PARAMS),)).encode("ascii"))
+
+# Names of other XRC parameters that may give the name of a file
+_FILE_PARAMS = ("url","animation")
+
+_fileParamRE = re.compile((r"<(%s)(\s[^>]*)?>([^<]*)</\1\s*>" %
+                           ("|".join(_FILE_PARAMS),)).encode("ascii"))
+
+
+class BitmapCache(LRUCache):
+    """LRUCache of wx.Bitmap objects, keyed by (path,size,mtime).
+
+    wx keeps its own cache of the bitmaps returned by ArtProviders, which
+    has no limits.  Whenever this cache evicts or clears entries, that cache
+    is cleared too so that the evicted bitmaps can actually be freed.
+    """
+
+    def _evict(self):
+        evictions = self.evictions
+        LRUCache._evict(self)
+        if self.evictions != evictions:
+            _clearArtCache()
+
+    def clear(self):
+        LRUCache.clear(self)
+        _clearArtCache()
+
+
+def _sizeOfBitmap(key,bmp):
+    return bmp.GetWidth() * bmp.GetHeight() * 4
+
+_bitmaps = memory.registerCache("bitmaps",
+                                BitmapCache(maxBytes=32*1024*1024,
+                                            sizeof=_sizeOfBitmap))
+
+
+def getBitmap(path,size=None,mtime=None):
+    """Get a wx.Bitmap of the image file at <path>, using the cache.
+
+    If <size> is given as a (width,height) tuple, the image is scaled to
+    that size.  If the file cannot be loaded, wx.NullBitmap is returned.
+    """
+    path = os.path.abspath(path)
+    if mtime is None:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return wx.NullBitmap
+    key = (path,size,mtime)
+    try:
+        return _bitmaps[key]
+    except KeyError:
+        pass
+    img = wx.Image(path,wx.BITMAP_TYPE_ANY)
+    if not img.Ok():
+        return wx.NullBitmap
+    if size is not None and size != (img.GetWidth(),img.GetHeight()):
+        img.Rescale(size[0],size[1])
+    bmp = wx.BitmapFromImage(img)
+    _bitmaps[key] = bmp
+    return bmp
+
+
+def getArtId(path):
+    """Get the ArtProvider ID under which the given image file is served."""
+    path = os.path.abspath(path)
+    return "%s%r:%s" % (ART_PREFIX,os.path.getmtime(path),path)
+
+
+def rewriteBitmaps(data,baseDir=None):
+    """Rewrite the bitmap parameters in XRC <data> to use the cache.
+
+    Each bitmap parameter that names an existing file, and does not already
+    have a stock_id, is given the stock_id from getArtId().  Its file name
+    is also made absolute, so that wx can still load it should the cache
+    fail.  Relative names are resolved against <baseDir>, and are left
+    unchanged if it is None.  If any bitmaps are rewritten, the names of
+    the other files listed in _FILE_PARAMS are made absolute in the same
+    way, so that the new data can be loaded from memory.
+
+    The tuple (<new data>,<number of bitmap parameters rewritten>) is
+    returned.
+    """
+    if not _enabled:
+        return (data,0)
+    count = [0]
+    def rewrite(match):
+        (tag,attrs,text) = match.groups()
+        attrs = attrs or b""
+        if b"stock_id" in attrs:
+            return match.group(0)
+        try:
+            path = unescape(text.decode("utf-8").strip())
+        except UnicodeDecodeError:
+            return match.group(0)
+        if not path:
+            return match.group(0)
+        if not os.path.isabs(path):
+            if baseDir is None:
+                return match.group(0)
+            path = os.path.join(baseDir,path)
+        if not os.path.isfile(path):
+            return match.group(0)
+        count[0] += 1
+        stockId = quoteattr(getArtId(path)).encode("utf-8")
+        path = escape(os.path.abspath(path)).encode("utf-8")
+        return b"<" + tag + attrs + b" stock_id=" + stockId + b">" + \
+               path + b"</" + tag + b">"
+    def absolutize(match):
+        (tag,attrs,text) = match.groups()
+        try:
+            path = unescape(text.decode("utf-8").strip())
+        except UnicodeDecodeError:
+            return match.group(0)
+        fileNm = path.split("#",1)[0]
+        if not fileNm or os.path.isabs(fileNm) or ":" in fileNm:
+            return match.group(0)
+        if not os.path.isfile(os.path.join(baseDir,fileNm)):
+            return match.group(0)
+        path = escape(os.path.abspath(os.path.join(baseDir,path)))
+        return b"<" + tag + (attrs or b"") + b">" + path.encode("utf-8") + \
+               b"</" + tag + b">"
+    data = _bitmapParamRE.sub(rewrite,data)
+    if count[0]:
+        _installProvider()
+        if baseDir is not None:
+            data = _fileParamRE.sub(absolutize,data)
+    return (data,count[0])
+
+
+########
+##
+##  ArtProvider serving bitmaps from the cache
+##
+########
+
+_ArtProviderBase = getattr(wx,"PyArtProvider",wx.ArtProvider)
+
+class _XRCArtProvider(_ArtProviderBase):
+    """ArtProvider for IDs produced by getArtId()."""
+
+    def CreateBitmap(self,artId,client,size):
+        if not artId.startswith(ART_PREFIX):
+            return wx.NullBitmap
+        (mtime,path) = artId[len(ART_PREFIX):].split(":",1)
+        size = tuple(size)
+        if size == (-1,-1):
+            size = None
+        return getBitmap(path,size,float(mtime))
+
+
+# The installed provider, if any
+_provider = []
+
+def _installProvider():
+    """Install the ArtProvider serving cached bitmaps, if not done already."""
+    if not _provider:
+        _provider.append(_XRCArtProvider())
+        wx.ArtProvider.Push(_provider[0])
+
+def _clearArtCache():
+    """Clear the cache of bitmaps kept by wx.ArtProvider.
+
+    wx clears this cache whenever the stack of providers changes, so an
+    empty provider is pushed and immediately popped again.
+    """
+    if _provider:
+        wx.ArtProvider.Push(_ArtProviderBase())
+        wx.ArtProvider.Pop()
+
+
+# Whether XRC data is rewritten to use the cache
+_enabled = True
+
+def enable():
+    """Make XRC resources loaded from now on use the bitmap cache."""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Make XRC resources loaded from now on decode bitmaps themselves."""
+    global _enabled
+    _enabled = False
+
+def isEnabled():
+    """Check whether XRC resources will use the bitmap cache."""
+    return _enabled
+
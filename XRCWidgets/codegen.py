@@ -0,0 +1,951 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.codegen:  Generate python code from XRC resources
+
+Loading a resource from an XRC file means parsing the XML, both in wx and
+to build the XRCIndex for the resource.  For windows that must appear as
+quickly as possible, this module can instead generate a python module that
+creates the widgets directly.  For the XRC file "mod.xrc" the generated
+module is "mod_xrcgen.py" in the same directory, which contains:
+
+    * XRCWIDGETS_CODEGEN:  the version of the generator that wrote it
+
+    * LOADERS:  maps resource names to functions taking the arguments
+                (<pre>,<parent>), which perform the two-phase creation of
+                the resource just like wx.XmlResource.LoadOnPanel() etc
+    * INDEXES:  maps resource names to the tables of their XRCIndex
+    * MAGIC:    maps the names of XRCWidget classes to their magic methods,
+                as (method name,child name,action) tuples
+
+XRCWidget uses the generated module automatically in place of the XRC file
+when it exists, is newer than the XRC file and was written by this version
+of the generator, unless the class attribute _useGeneratedCode is false.
+Other files that happen to have the same name are never imported.  The
+magic methods of a class are only taken from the module if it is also
+newer than the file defining the class.
+
+Modules are generated from the command line:
+
+    python -m XRCWidgets.codegen [-c <module>.<class> ...] <file.xrc> ...
+
+Each class given with -c has its magic methods recorded, and its XRC file is
+generated if it is not also listed.  Only plain XRC files on the filesystem
+are supported.  Resources using XRC classes that the generator does not
+understand are skipped, and continue to be loaded from the XRC file.
+
+"""
+
+import os
+import sys
+import io
+import pprint
+from optparse import OptionParser
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+try:
+    from importlib.util import spec_from_file_location, module_from_spec
+except ImportError:
+    spec_from_file_location = None
+    import imp
+
+from XRCWidgets import XRCWidgetsError
+from XRCWidgets import resources
+from XRCWidgets.utils import XMLDocTree, XMLElementData, importClass
+from XRCWidgets.index import XRCIndex, addIndex
+
+
+class CodegenError(XRCWidgetsError):
+    """Raised when code cannot be generated for an XRC resource."""
+    pass
+
+
+# Version of the generated code, recorded in each generated module.  It
+# must be changed whenever the format of generated modules changes.
+CODEGEN_VERSION = 1
+
+# Line identifying a module written by this version of the generator
+_MARKER = "XRCWIDGETS_CODEGEN = %d" % (CODEGEN_VERSION,)
+
+
+########
+##
+##  Locating and loading generated modules
+##
+########
+
+
+def generatedPath(location):
+    """Get the path of the generated module for the XRC file at <location>.
+
+    None is returned if code cannot be generated for that location.
+    """
+    if not resources.isPlainFile(location):
+        return None
+    return os.path.splitext(location)[0] + "_xrcgen.py"
+
+
+def isUpToDate(location):
+    """Check whether the generated module for <location> can be used.
+
+    The module must be newer than the XRC file, and must carry the marker
+    written by this version of the generator in its header.
+    """
+    pth = generatedPath(location)
+    if pth is None or not os.path.isfile(pth):
+        return False
+    if os.path.getmtime(pth) < resources.getMTime(location):
+        return False
+    return _hasMarker(pth)
+
+
+def _hasMarker(pth):
+    """Check whether the header of the module at <pth> has the marker."""
+    f = open(pth,"rb")
+    try:
+        for ln in f.read(4096).splitlines():
+            if ln.decode("utf-8","replace").strip() == _MARKER:
+                return True
+    finally:
+        f.close()
+    return False
+
+
+def loadGenerated(location):
+    """Load the generated module for the XRC file at <location>.
+
+    If there is no up-to-date module then None is returned.  The indexes
+    stored in the module are made available from XRCWidgets.getIndex().
+    """
+    if not isUpToDate(location):
+        return None
+    pth = generatedPath(location)
+    modName = "_xrcgen_" + md5(pth.encode("utf-8")).hexdigest()
+    if spec_from_file_location is not None:
+        spec = spec_from_file_location(modName,pth)
+        mod = module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    else:
+        mod = imp.load_source(modName,pth)
+    if getattr(mod,"XRCWIDGETS_CODEGEN",None) != CODEGEN_VERSION:
+        return None
+    for (rName,tables) in mod.INDEXES.items():
+        addIndex(location,rName,XRCIndex.fromTables(tables))
+    return mod
+
+
+def isNewerThanClass(mod,cls):
+    """Check whether generated module <mod> is newer than class <cls>.
+
+    This is used to determine whether the magic methods recorded in the
+    module are still accurate.
+    """
+    srcFile = getattr(sys.modules.get(cls.__module__),"__file__",None)
+    if srcFile is None:
+        return False
+    if srcFile[-4:] in (".pyc",".pyo") and os.path.isfile(srcFile[:-1]):
+        srcFile = srcFile[:-1]
+    try:
+        return os.path.getmtime(mod.__file__) >= os.path.getmtime(srcFile)
+    except OSError:
+        return False
+
+
+########
+##
+##  Generation of code for a single resource
+##
+########
+
+
+def _children(data,name=None):
+    """Get the child elements of <data>, optionally only those named <name>."""
+    chldrn = [c for c in data.children if isinstance(c,XMLElementData)]
+    if name is not None:
+        chldrn = [c for c in chldrn if c.name == name]
+    return chldrn
+
+def _text(data):
+    """Get the text content of the element <data>."""
+    strs = [t for t in data.children if not isinstance(t,XMLElementData)]
+    return u"".join(strs)
+
+def _param(data,name,default=None):
+    """Get the text of the parameter <name> of the object <data>."""
+    for c in _children(data,name):
+        return _text(c)
+    return default
+
+def _xrcText(text):
+    """Convert text from an XRC file in the same way as wx.
+
+    Underscores mark accelerators and must be doubled to appear literally,
+    while backslashes introduce the escapes \\n, \\t, \\r and \\\\.
+    """
+    out = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        nxt = text[i+1:i+2]
+        if c == "_":
+            if nxt == "_":
+                out.append("_")
+                i += 1
+            else:
+                out.append("&")
+        elif c == "\\" and nxt in ("n","t","r","\\"):
+            out.append({"n":"\n","t":"\t","r":"\r","\\":"\\"}[nxt])
+            i += 1
+        else:
+            out.append(c)
+        i += 1
+    return u"".join(out)
+
+
+class ResourceGenerator:
+    """Generates the loader function for a single XRC resource.
+
+    The generated function performs two-phase creation on the object <pre>
+    that it is given, then creates all the children of the resource.  Each
+    XRC window class is handled by a method named _gen_<class>, which must
+    emit the code to create the window in the given variable.  CodegenError
+    is raised for classes that are not supported, and for any parameter or
+    child element that the generator does not understand, so that such
+    resources are loaded from the XRC file instead.
+    """
+
+    def __init__(self,data):
+        self.data = data
+        self.lines = []
+        self._nextVar = 0
+
+    def generate(self,funcName):
+        """Get the source code of the loader function, as a list of lines."""
+        self.lines = []
+        self._nextVar = 0
+        data = self.data
+        cls = data.attrs.get("class")
+        if cls not in ("wxPanel","wxDialog","wxFrame"):
+            raise CodegenError("Unsupported resource class: '%s'" % (cls,))
+        if cls == "wxPanel":
+            self.checkParams(data,_WINDOW_PARAMS + ("object",))
+        else:
+            self.checkParams(data,_WINDOW_PARAMS + _TOPLEVEL_PARAMS)
+        args = ["parent",self.id(data)]
+        if cls == "wxPanel":
+            style = self.style(data,"wx.TAB_TRAVERSAL")
+        else:
+            args.append(self.text(data,"title"))
+            if cls == "wxFrame":
+                style = self.style(data,"wx.DEFAULT_FRAME_STYLE")
+            else:
+                style = self.style(data,"wx.DEFAULT_DIALOG_STYLE")
+        args.extend([self.pos(data,"parent"),self.size(data,"parent"),style,
+                     self.name(data)])
+        self.emit("pre.Create(%s)",",".join(args))
+        self.setupWindow(data,"pre")
+        self.windowChildren(data,"pre")
+        if cls != "wxPanel":
+            icon = _children(data,"icon")
+            if icon:
+                bmp = self.bitmap(icon[0])
+                self.emit("pre.SetIcon(wx.IconFromBitmap(%s))",bmp)
+            if self.boolParam(data,"centered"):
+                self.emit("pre.Centre()")
+        doc = "Load resource %s onto <pre>." % (self.name(data),)
+        lines = ["def %s(pre,parent):" % (funcName,),
+                 "    \"\"\"%s\"\"\"" % (doc,)]
+        lines.extend(["    " + ln for ln in self.lines])
+        return lines
+
+    def emit(self,line,*args):
+        """Add a line to the generated code, formatted with <args>."""
+        if args:
+            line = line % args
+        self.lines.append(line)
+
+    def checkParams(self,data,known):
+        """Raise CodegenError if <data> has child elements not in <known>."""
+        for c in _children(data):
+            if c.name not in known:
+                eStr = "Unsupported parameter of %s: '%s'"
+                raise CodegenError(eStr % (data.attrs.get("class"),c.name))
+
+    def newVar(self,prefix="w"):
+        self._nextVar += 1
+        return "%s%d" % (prefix,self._nextVar)
+
+    ##  Conversion of parameter values into python expressions
+
+    def id(self,data):
+        name = data.attrs.get("name")
+        if name is None:
+            return "-1"
+        return "XRCID(%r)" % (name,)
+
+    def name(self,data):
+        return repr(data.attrs.get("name",u""))
+
+    def text(self,data,name,default=u""):
+        return repr(_xrcText(_param(data,name,default)))
+
+    def intParam(self,data,name,default=0):
+        value = _param(data,name)
+        if value is None:
+            return default
+        try:
+            return int("".join(value.split()))
+        except ValueError:
+            eStr = "Invalid integer for '%s': '%s'" % (name,value)
+            raise CodegenError(eStr)
+
+    def boolParam(self,data,name,default=False):
+        return bool(self.intParam(data,name,int(default)))
+
+    def hasParam(self,data,name):
+        return _param(data,name) is not None
+
+    def style(self,data,default="0",name="style"):
+        value = _param(data,name)
+        if value is None:
+            return default
+        flags = []
+        for flag in "".join(value.split()).split("|"):
+            if not flag.startswith("wx"):
+                raise CodegenError("Unsupported flag: '%s'" % (flag,))
+            flags.append("wx." + flag[2:])
+        return "|".join(flags)
+
+    def _pair(self,data,name):
+        value = _param(data,name)
+        if value is None:
+            return None
+        value = "".join(value.split())
+        dlgUnits = value.endswith("d")
+        if dlgUnits:
+            value = value[:-1]
+        try:
+            (x,y) = [int(v) for v in value.split(",")]
+        except ValueError:
+            raise CodegenError("Invalid value for '%s': '%s'" % (name,value))
+        return (x,y,dlgUnits)
+
+    def pos(self,data,parentVar):
+        pair = self._pair(data,"pos")
+        if pair is None:
+            return "wx.DefaultPosition"
+        expr = "wx.Point(%d,%d)" % pair[:2]
+        if pair[2]:
+            expr = "%s.ConvertDialogPointToPixels(%s)" % (parentVar,expr)
+        return expr
+
+    def size(self,data,parentVar,name="size"):
+        pair = self._pair(data,name)
+        if pair is None:
+            return "wx.DefaultSize"
+        expr = "wx.Size(%d,%d)" % pair[:2]
+        if pair[2]:
+            expr = "%s.ConvertDialogSizeToPixels(%s)" % (parentVar,expr)
+        return expr
+
+    def colour(self,value):
+        if not value.startswith("#") or len(value) != 7:
+            raise CodegenError("Unsupported colour: '%s'" % (value,))
+        rgb = [int(value[i:i+2],16) for i in (1,3,5)]
+        return "wx.Colour(%d,%d,%d)" % tuple(rgb)
+
+    def font(self,data):
+        """Get an expression creating the font described by <data>."""
+        self.checkParams(data,("size","style","weight","family",
+                               "underlined","face"))
+        if self.hasParam(data,"size"):
+            size = "%d" % (self.intParam(data,"size"),)
+        else:
+            size = "wx.NORMAL_FONT.GetPointSize()"
+        args = [size]
+        for (nm,values) in (("family",_FONT_FAMILIES),
+                            ("style",_FONT_STYLES),
+                            ("weight",_FONT_WEIGHTS)):
+            value = (_param(data,nm) or "").strip()
+            try:
+                args.append(values[value])
+            except KeyError:
+                eStr = "Unsupported font %s: '%s'" % (nm,value)
+                raise CodegenError(eStr)
+        args.append("%s" % (self.boolParam(data,"underlined"),))
+        face = (_param(data,"face") or "").strip()
+        if "," in face:
+            eStr = "Lists of font faces are not supported: '%s'" % (face,)
+            raise CodegenError(eStr)
+        args.append(repr(face))
+        return "wx.Font(%s)" % (",".join(args),)
+
+    def bitmap(self,data,client="wxART_OTHER"):
+        if data is None:
+            return "wx.NullBitmap"
+        stockId = data.attrs.get("stock_id")
+        if stockId is not None:
+            client = data.attrs.get("stock_client",client)
+            return "wx.ArtProvider.GetBitmap(%r,%r)" % (stockId,client)
+        fileNm = _text(data)
+        if not fileNm:
+            return "wx.NullBitmap"
+        return "_bitmap(%r)" % (fileNm,)
+
+    def bitmapParam(self,data,name,client="wxART_OTHER"):
+        return self.bitmap((_children(data,name) or [None])[0],client)
+
+    def choices(self,data):
+        items = []
+        for content in _children(data,"content"):
+            for item in _children(content,"item"):
+                items.append(_xrcText(_text(item)))
+        return repr(items)
+
+    ##  Generation of windows and their children
+
+    def setupWindow(self,data,var):
+        """Emit code applying the parameters common to all windows."""
+        if self.hasParam(data,"exstyle"):
+            style = self.style(data,name="exstyle")
+            self.emit("%s.SetExtraStyle(%s)",var,style)
+        if self.hasParam(data,"fg"):
+            colour = self.colour(_param(data,"fg"))
+            self.emit("%s.SetForegroundColour(%s)",var,colour)
+        if self.hasParam(data,"bg"):
+            colour = self.colour(_param(data,"bg"))
+            self.emit("%s.SetBackgroundColour(%s)",var,colour)
+        if not self.boolParam(data,"enabled",True):
+            self.emit("%s.Enable(False)",var)
+        if self.boolParam(data,"focused"):
+            self.emit("%s.SetFocus()",var)
+        if self.boolParam(data,"hidden"):
+            self.emit("%s.Show(False)",var)
+        if self.hasParam(data,"tooltip"):
+            self.emit("%s.SetToolTipString(%s)",var,self.text(data,"tooltip"))
+        if self.hasParam(data,"help"):
+            self.emit("%s.SetHelpText(%s)",var,self.text(data,"help"))
+        for font in _children(data,"font"):
+            self.emit("%s.SetFont(%s)",var,self.font(font))
+
+    def windowChildren(self,data,var):
+        """Emit code creating the child objects of window <data>."""
+        for c in _children(data,"object"):
+            cls = c.attrs.get("class")
+            if cls in _SIZER_CLASSES:
+                sVar = self.sizer(c,var)
+                self.emit("%s.SetSizer(%s)",var,sVar)
+                if not self.hasParam(data,"size"):
+                    self.emit("%s.Fit(%s)",sVar,var)
+                resizable = "wx.MAXIMIZE_BOX|wx.RESIZE_BORDER"
+                self.emit("if %s.GetWindowStyle() & (%s):",var,resizable)
+                self.emit("    %s.SetSizeHints(%s)",sVar,var)
+            elif cls == "wxMenuBar":
+                self.emit("%s.SetMenuBar(%s)",var,self.menuBar(c))
+            elif cls == "wxToolBar":
+                tVar = self.window(c,var)
+                if var == "pre" and self.data.attrs.get("class") == "wxFrame":
+                    if not self.boolParam(c,"dontattachtoframe"):
+                        self.emit("%s.SetToolBar(%s)",var,tVar)
+            else:
+                self.window(c,var)
+
+    def window(self,data,parentVar):
+        """Emit code creating the window <data>, returning its variable."""
+        cls = data.attrs.get("class")
+        if data.name != "object":
+            raise CodegenError("Unsupported element: '%s'" % (data.name,))
+        if data.attrs.get("subclass"):
+            eStr = "Unsupported subclass: '%s'" % (data.attrs["subclass"],)
+            raise CodegenError(eStr)
+        try:
+            gen = getattr(self,"_gen_"+cls)
+        except (AttributeError,TypeError):
+            raise CodegenError("Unsupported class: '%s'" % (cls,))
+        self.checkParams(data,_WINDOW_PARAMS + _CLASS_PARAMS.get(cls,()))
+        var = self.newVar()
+        gen(data,var,parentVar)
+        self.setupWindow(data,var)
+        return var
+
+    def create(self,data,var,parentVar,ctor,extra=(),style="0",
+               choices=False,pre=(),dimension=None):
+        """Emit code creating a window with constructor <ctor>.
+
+        The arguments are given in the standard order; parent, id, <pre>,
+        pos, size, choices (if <choices> is true), <dimension> (if given),
+        style, <extra> and name.
+        """
+        args = [parentVar,self.id(data)] + list(pre)
+        args.extend([self.pos(data,parentVar),self.size(data,parentVar)])
+        if choices:
+            args.append(self.choices(data))
+        if dimension is not None:
+            args.append(dimension)
+        args.append(self.style(data,style))
+        args.extend(extra)
+        args.append("name=" + self.name(data))
+        self.emit("%s = %s(%s)",var,ctor,",".join(args))
+
+    def _gen_wxPanel(self,data,var,parentVar):
+        self.create(data,var,parentVar,"wx.Panel",style="wx.TAB_TRAVERSAL")
+        self.windowChildren(data,var)
+
+    def _gen_wxScrolledWindow(self,data,var,parentVar):
+        style = "wx.HSCROLL|wx.VSCROLL"
+        self.create(data,var,parentVar,"wx.ScrolledWindow",style=style)
+        rate = self._pair(data,"scrollrate")
+        if rate is not None:
+            self.emit("%s.SetScrollRate(%d,%d)",var,rate[0],rate[1])
+        self.windowChildren(data,var)
+
+    def _gen_wxButton(self,data,var,parentVar):
+        label = self.text(data,"label")
+        self.create(data,var,parentVar,"wx.Button",pre=(label,))
+        if self.boolParam(data,"default"):
+            self.emit("%s.SetDefault()",var)
+
+    def _gen_wxBitmapButton(self,data,var,parentVar):
+        bmp = self.bitmapParam(data,"bitmap")
+        self.create(data,var,parentVar,"wx.BitmapButton",pre=(bmp,),
+                    style="wx.BU_AUTODRAW")
+        if self.boolParam(data,"default"):
+            self.emit("%s.SetDefault()",var)
+
+    def _gen_wxToggleButton(self,data,var,parentVar):
+        label = self.text(data,"label")
+        self.create(data,var,parentVar,"wx.ToggleButton",pre=(label,))
+        if self.boolParam(data,"checked"):
+            self.emit("%s.SetValue(True)",var)
+
+    def _gen_wxStaticText(self,data,var,parentVar):
+        label = self.text(data,"label")
+        self.create(data,var,parentVar,"wx.StaticText",pre=(label,))
+
+    def _gen_wxStaticBitmap(self,data,var,parentVar):
+        bmp = self.bitmapParam(data,"bitmap")
+        self.create(data,var,parentVar,"wx.StaticBitmap",pre=(bmp,))
+
+    def _gen_wxStaticLine(self,data,var,parentVar):
+        style = "wx.LI_HORIZONTAL"
+        self.create(data,var,parentVar,"wx.StaticLine",style=style)
+
+    def _gen_wxStaticBox(self,data,var,parentVar):
+        label = self.text(data,"label")
+        self.create(data,var,parentVar,"wx.StaticBox",pre=(label,))
+
+    def _gen_wxTextCtrl(self,data,var,parentVar):
+        value = self.text(data,"value")
+        self.create(data,var,parentVar,"wx.TextCtrl",pre=(value,))
+        if self.hasParam(data,"maxlength"):
+            maxLen = self.intParam(data,"maxlength")
+            self.emit("%s.SetMaxLength(%d)",var,maxLen)
+
+    def _gen_wxCheckBox(self,data,var,parentVar):
+        label = self.text(data,"label")
+        self.create(data,var,parentVar,"wx.CheckBox",pre=(label,))
+        if self.boolParam(data,"checked"):
+            self.emit("%s.SetValue(True)",var)
+
+    def _gen_wxRadioButton(self,data,var,parentVar):
+        label = self.text(data,"label")
+        self.create(data,var,parentVar,"wx.RadioButton",pre=(label,))
+        self.emit("%s.SetValue(%s)",var,self.boolParam(data,"value"))
+
+    def _selection(self,data,var):
+        if self.hasParam(data,"selection"):
+            sel = self.intParam(data,"selection")
+            self.emit("%s.SetSelection(%d)",var,sel)
+
+    def _gen_wxComboBox(self,data,var,parentVar):
+        value = self.text(data,"value")
+        self.create(data,var,parentVar,"wx.ComboBox",pre=(value,),
+                    choices=True)
+        self._selection(data,var)
+
+    def _gen_wxChoice(self,data,var,parentVar):
+        self.create(data,var,parentVar,"wx.Choice",choices=True)
+        self._selection(data,var)
+
+    def _gen_wxListBox(self,data,var,parentVar):
+        self.create(data,var,parentVar,"wx.ListBox",choices=True)
+        self._selection(data,var)
+
+    def _gen_wxRadioBox(self,data,var,parentVar):
+        label = self.text(data,"label")
+        dim = "%d" % (self.intParam(data,"dimension",1),)
+        self.create(data,var,parentVar,"wx.RadioBox",pre=(label,),
+                    choices=True,dimension=dim,style="wx.RA_SPECIFY_COLS")
+        self._selection(data,var)
+
+    def _gen_wxSlider(self,data,var,parentVar):
+        limits = ["%d" % self.intParam(data,nm,dflt) for (nm,dflt) in
+                        (("value",0),("min",0),("max",100))]
+        self.create(data,var,parentVar,"wx.Slider",pre=limits,
+                    style="wx.SL_HORIZONTAL")
+
+    def _gen_wxGauge(self,data,var,parentVar):
+        rng = "%d" % (self.intParam(data,"range",100),)
+        self.create(data,var,parentVar,"wx.Gauge",pre=(rng,),
+                    style="wx.GA_HORIZONTAL")
+        if self.hasParam(data,"value"):
+            self.emit("%s.SetValue(%d)",var,self.intParam(data,"value"))
+
+    def _gen_wxSpinCtrl(self,data,var,parentVar):
+        limits = ["%d" % self.intParam(data,nm,dflt) for (nm,dflt) in
+                        (("min",0),("max",100),("value",0))]
+        self.create(data,var,parentVar,"wx.SpinCtrl",pre=("u''",),
+                    extra=limits,style="wx.SP_ARROW_KEYS")
+
+    def _gen_wxNotebook(self,data,var,parentVar):
+        self.create(data,var,parentVar,"wx.Notebook")
+        for page in _children(data,"object"):
+            cls = page.attrs.get("class")
+            if cls != "notebookpage":
+                eStr = "Unsupported notebook child: '%s'" % (cls,)
+                raise CodegenError(eStr)
+            self.checkParams(page,("object","label","selected"))
+            wins = _children(page,"object")
+            if len(wins) != 1:
+                raise CodegenError("Notebook page must contain one window")
+            pVar = self.window(wins[0],var)
+            label = self.text(page,"label")
+            selected = self.boolParam(page,"selected")
+            self.emit("%s.AddPage(%s,%s,%s)",var,pVar,label,selected)
+
+    def _gen_wxToolBar(self,data,var,parentVar):
+        style = "wx.NO_BORDER|wx.TB_HORIZONTAL"
+        self.create(data,var,parentVar,"wx.ToolBar",style=style)
+        for (nm,meth) in (("bitmapsize","SetToolBitmapSize"),
+                          ("margins","SetMargins")):
+            if self.hasParam(data,nm):
+                size = self.size(data,parentVar,nm)
+                self.emit("%s.%s(%s)",var,meth,size)
+        for (nm,meth) in (("packing","SetToolPacking"),
+                          ("separation","SetToolSeparation")):
+            if self.hasParam(data,nm):
+                self.emit("%s.%s(%d)",var,meth,self.intParam(data,nm))
+        for c in _children(data,"object"):
+            cls = c.attrs.get("class")
+            if cls == "separator":
+                self.emit("%s.AddSeparator()",var)
+            elif cls == "tool":
+                self.tool(c,var)
+            else:
+                self.emit("%s.AddControl(%s)",var,self.window(c,var))
+        self.emit("%s.Realize()",var)
+
+    def tool(self,data,tbVar):
+        """Emit code adding the tool <data> to toolbar <tbVar>."""
+        self.checkParams(data,("bitmap","bitmap2","toggle","radio","label",
+                               "tooltip","longhelp","disabled","checked"))
+        if self.boolParam(data,"toggle"):
+            kind = "wx.ITEM_CHECK"
+        elif self.boolParam(data,"radio"):
+            kind = "wx.ITEM_RADIO"
+        else:
+            kind = "wx.ITEM_NORMAL"
+        tid = self.id(data)
+        args = [tid,self.text(data,"label"),
+                self.bitmapParam(data,"bitmap","wxART_TOOLBAR"),
+                self.bitmapParam(data,"bitmap2","wxART_TOOLBAR"),
+                kind,self.text(data,"tooltip"),self.text(data,"longhelp")]
+        self.emit("%s.AddLabelTool(%s)",tbVar,",".join(args))
+        if self.boolParam(data,"disabled"):
+            self.emit("%s.EnableTool(%s,False)",tbVar,tid)
+        if self.boolParam(data,"checked"):
+            self.emit("%s.ToggleTool(%s,True)",tbVar,tid)
+
+    ##  Generation of sizers
+
+    def sizer(self,data,winVar):
+        """Emit code creating sizer <data> within window <winVar>."""
+        cls = data.attrs.get("class")
+        self.checkParams(data,("object","orient","label","rows","cols",
+                               "vgap","hgap","growablerows","growablecols"))
+        var = self.newVar("s")
+        if cls == "wxBoxSizer":
+            orient = self.style(data,"wx.HORIZONTAL","orient")
+            self.emit("%s = wx.BoxSizer(%s)",var,orient)
+        elif cls == "wxStaticBoxSizer":
+            orient = self.style(data,"wx.HORIZONTAL","orient")
+            label = self.text(data,"label")
+            box = "wx.StaticBox(%s,-1,%s)" % (winVar,label)
+            self.emit("%s = wx.StaticBoxSizer(%s,%s)",var,box,orient)
+        elif cls in ("wxGridSizer","wxFlexGridSizer"):
+            dims = [self.intParam(data,nm,dflt) for (nm,dflt) in
+                        (("rows",0),("cols",2),("vgap",0),("hgap",0))]
+            self.emit("%s = wx.%s(%d,%d,%d,%d)",var,cls[2:],*dims)
+            if cls == "wxFlexGridSizer":
+                for (nm,meth) in (("growablerows","AddGrowableRow"),
+                                  ("growablecols","AddGrowableCol")):
+                    for idx in (_param(data,nm) or "").split(","):
+                        if idx.strip():
+                            self.emit("%s.%s(%d)",var,meth,int(idx))
+        else:
+            raise CodegenError("Unsupported sizer class: '%s'" % (cls,))
+        for item in _children(data,"object"):
+            iCls = item.attrs.get("class")
+            self.checkParams(item,("object","option","flag","border",
+                                   "size","minsize"))
+            flags = (self.intParam(item,"option"),
+                     self.style(item,"0","flag"),
+                     self.intParam(item,"border"))
+            if iCls == "spacer":
+                pair = self._pair(item,"size") or (0,0,False)
+                if pair[2]:
+                    eStr = "Spacer sizes in dialog units are not supported"
+                    raise CodegenError(eStr)
+                spacer = "(%d,%d)" % pair[:2]
+                self.emit("%s.Add(%s,%d,%s,%d)",var,spacer,*flags)
+            elif iCls == "sizeritem":
+                objs = _children(item,"object")
+                if len(objs) != 1:
+                    raise CodegenError("Sizer item must contain one object")
+                if objs[0].attrs.get("class") in _SIZER_CLASSES:
+                    cVar = self.sizer(objs[0],winVar)
+                else:
+                    cVar = self.window(objs[0],winVar)
+                self.emit("%s.Add(%s,%d,%s,%d)",var,cVar,*flags)
+                if self.hasParam(item,"minsize"):
+                    size = self.size(item,winVar,"minsize")
+                    self.emit("%s.SetItemMinSize(%s,%s)",var,cVar,size)
+            else:
+                raise CodegenError("Unsupported sizer child: '%s'" % (iCls,))
+        return var
+
+    ##  Generation of menus
+
+    def menuBar(self,data):
+        """Emit code creating the menubar <data>, returning its variable."""
+        self.checkParams(data,("object","style"))
+        var = self.newVar("mb")
+        self.emit("%s = wx.MenuBar(%s)",var,self.style(data))
+        for menu in _children(data,"object"):
+            cls = menu.attrs.get("class")
+            if cls != "wxMenu":
+                eStr = "Unsupported menubar child: '%s'" % (cls,)
+                raise CodegenError(eStr)
+            mVar = self.menu(menu)
+            self.emit("%s.Append(%s,%s)",var,mVar,self.text(menu,"label"))
+            if not self.boolParam(menu,"enabled",True):
+                self.emit("%s.EnableTop(%s.GetMenuCount()-1,False)",var,var)
+        return var
+
+    def menu(self,data):
+        """Emit code creating the menu <data>, returning its variable."""
+        self.checkParams(data,("object","label","style","help","enabled"))
+        var = self.newVar("m")
+        if self.hasParam(data,"style"):
+            self.emit("%s = wx.Menu(style=%s)",var,self.style(data))
+        else:
+            self.emit("%s = wx.Menu()",var)
+        for c in _children(data,"object"):
+            cls = c.attrs.get("class")
+            if cls == "separator":
+                self.emit("%s.AppendSeparator()",var)
+            elif cls == "break":
+                self.emit("%s.Break()",var)
+            elif cls == "wxMenu":
+                sVar = self.menu(c)
+                args = (self.id(c),self.text(c,"label"),sVar,
+                        self.text(c,"help"))
+                self.emit("%s.AppendMenu(%s)",var,",".join(args))
+                self.menuItemState(c,var)
+            elif cls == "wxMenuItem":
+                self.checkParams(c,("label","accel","help","checkable",
+                                    "radio","enabled","checked"))
+                label = _xrcText(_param(c,"label",u""))
+                if _param(c,"accel"):
+                    label = label + u"\t" + _xrcText(_param(c,"accel"))
+                if self.boolParam(c,"checkable"):
+                    kind = "wx.ITEM_CHECK"
+                elif self.boolParam(c,"radio"):
+                    kind = "wx.ITEM_RADIO"
+                else:
+                    kind = "wx.ITEM_NORMAL"
+                args = (self.id(c),repr(label),self.text(c,"help"),kind)
+                self.emit("%s.Append(%s)",var,",".join(args))
+                self.menuItemState(c,var)
+            else:
+                raise CodegenError("Unsupported menu child: '%s'" % (cls,))
+        return var
+
+    def menuItemState(self,data,menuVar):
+        if not self.boolParam(data,"enabled",True):
+            self.emit("%s.Enable(%s,False)",menuVar,self.id(data))
+        if self.boolParam(data,"checked"):
+            self.emit("%s.Check(%s,True)",menuVar,self.id(data))
+
+
+_SIZER_CLASSES = ("wxBoxSizer","wxStaticBoxSizer","wxGridSizer",
+                  "wxFlexGridSizer")
+
+# Parameters understood for all windows, as applied by setupWindow()
+_WINDOW_PARAMS = ("pos","size","style","exstyle","fg","bg","enabled",
+                  "focused","hidden","tooltip","help","font")
+
+# Additional parameters understood for top-level dialogs and frames
+_TOPLEVEL_PARAMS = ("object","title","icon","centered")
+
+# Additional parameters understood for each window class.  Only classes
+# whose generator creates child objects may have "object" children.
+_CLASS_PARAMS = {
+    "wxPanel":          ("object",),
+    "wxScrolledWindow": ("object","scrollrate"),
+    "wxButton":         ("label","default"),
+    "wxBitmapButton":   ("bitmap","default"),
+    "wxToggleButton":   ("label","checked"),
+    "wxStaticText":     ("label",),
+    "wxStaticBitmap":   ("bitmap",),
+    "wxStaticBox":      ("label",),
+    "wxTextCtrl":       ("value","maxlength"),
+    "wxCheckBox":       ("label","checked"),
+    "wxRadioButton":    ("label","value"),
+    "wxComboBox":       ("value","content","selection"),
+    "wxChoice":         ("content","selection"),
+    "wxListBox":        ("content","selection"),
+    "wxRadioBox":       ("label","dimension","content","selection"),
+    "wxSlider":         ("value","min","max"),
+    "wxGauge":          ("range","value"),
+    "wxSpinCtrl":       ("min","max","value"),
+    "wxNotebook":       ("object",),
+    "wxToolBar":        ("object","bitmapsize","margins","packing",
+                         "separation","dontattachtoframe"),
+}
+
+# Values of the parameters of fonts, as understood by wx
+_FONT_FAMILIES = {"": "wx.DEFAULT", "default": "wx.DEFAULT",
+                  "decorative": "wx.DECORATIVE", "roman": "wx.ROMAN",
+                  "script": "wx.SCRIPT", "swiss": "wx.SWISS",
+                  "modern": "wx.MODERN", "teletype": "wx.TELETYPE"}
+_FONT_STYLES = {"": "wx.NORMAL", "normal": "wx.NORMAL",
+                "italic": "wx.ITALIC", "slant": "wx.SLANT"}
+_FONT_WEIGHTS = {"": "wx.NORMAL", "normal": "wx.NORMAL",
+                 "bold": "wx.BOLD", "light": "wx.LIGHT"}
+
+
+########
+##
+##  Generation of complete modules
+##
+########
+
+_HEADER = '''# -*- coding: utf-8 -*-
+#
+# Generated by XRCWidgets.codegen from %(xrcfile)r.
+# Do not edit; changes will be lost when the module is regenerated with:
+#
+#    python -m XRCWidgets.codegen %(xrcfile)s
+#
+
+%(marker)s
+
+import os
+import wx
+from wx import xrc
+from XRCWidgets.bitmaps import getBitmap
+
+XRCID = xrc.XRCID
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+def _bitmap(fileNm):
+    return getBitmap(os.path.join(_HERE,fileNm))
+
+'''
+
+def generateModule(location,classes=()):
+    """Generate the source of a module for the XRC file at <location>.
+
+    A loader function and index is generated for each top-level resource
+    in the file that can be converted; others are listed in a comment.
+    Magic methods are recorded for each XRCWidget class in <classes>.
+    """
+    data = resources.getData(location)
+    tree = XMLDocTree(io.BytesIO(data))
+    lines = [_HEADER % {"xrcfile": os.path.basename(location),
+                        "marker": _MARKER}]
+    loaders = []
+    indexes = {}
+    skipped = []
+    for res in _children(tree.root,"object"):
+        rName = res.attrs.get("name")
+        if rName is None:
+            continue
+        funcName = "load_%d" % (len(loaders),)
+        try:
+            funcLines = ResourceGenerator(res).generate(funcName)
+        except CodegenError:
+            skipped.append((rName,str(sys.exc_info()[1])))
+            continue
+        lines.extend(funcLines)
+        lines.append("")
+        loaders.append((rName,funcName))
+        indexes[rName] = XRCIndex(tree,rName).getTables()
+    for (rName,reason) in skipped:
+        lines.append("# Not generated: %r (%s)" % (rName,reason))
+    lines.append("")
+    lines.append("LOADERS = {")
+    for (rName,funcName) in loaders:
+        lines.append("    %r: %s," % (rName,funcName))
+    lines.append("}")
+    lines.append("")
+    lines.append("INDEXES = " + pprint.pformat(indexes))
+    lines.append("")
+    magic = {}
+    for cls in classes:
+        clsNm = "%s.%s" % (cls.__module__,cls.__name__)
+        magic[clsNm] = cls._getMagicMethods()
+    lines.append("MAGIC = " + pprint.pformat(magic))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def writeModule(location,classes=()):
+    """Generate and write the module for the XRC file at <location>.
+
+    The path of the module written is returned.
+    """
+    pth = generatedPath(location)
+    if pth is None:
+        eStr = "Cannot generate code for XRC location '%s'" % (location,)
+        raise CodegenError(eStr)
+    source = generateModule(location,classes)
+    if not isinstance(source,type(u"")):
+        source = source.decode("utf-8")
+    f = io.open(pth,"w",encoding="utf-8")
+    try:
+        f.write(source)
+    finally:
+        f.close()
+    return pth
+
+
+def main(argv=None):
+    """Command-line entry point; see module documentation for usage."""
+    parser = OptionParser(usage="%prog [-c module.Class ...] [file.xrc ...]")
+    parser.add_option("-c","--class",dest="classes",action="append",
+                      default=[],metavar="CLASS",
+                      help="record magic methods of XRCWidget class CLASS")
+    (opts,args) = parser.parse_args(argv)
+    byFile = {}
+    for fileNm in args:
+        byFile.setdefault(os.path.abspath(fileNm),[])
+    for clsName in opts.classes:
+        cls = importClass(clsName)
+        location = os.path.abspath(cls._findXRCFile())
+        byFile.setdefault(location,[]).append(cls)
+    if not byFile:
+        parser.error("no XRC files or classes given")
+    for (location,classes) in sorted(byFile.items()):
+        print(writeModule(location,classes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,7 +18,9 @@ returned by the function getConnectors().
 """
 
 import wx
-from XRCWidgets.utils import lcurry
+from XRCWidgets import NotGiven
+from XRCWidgets import memory
+from XRCWidgets.utils import lcurry, wcurry
 
 class Connector:
     """Class responsible for connecting events within XRCWidgets
@@ -31,6 +33,9 @@ class Connector:
     # methods, one per child type.  The entries are listed on
     # the class
     _cons_entries = ()
+
+    # Name of the action handled by this connector
+    action = None
     
     def __init__(self):
         self._cons = {}
@@ -46,6 +51,37 @@ class Connector:
         if self._cons.has_key(cType):
             return self._cons[cType](cName,parent,handler)
         return False
+
+    def supports(self,cType):
+        """Check whether children of type <cType> can be connected."""
+        return self._cons.has_key(cType)
+
+    def _makeHandler(self,cName,parent,dispatch,handler,*args):
+        """Make the callable to be connected as an event handler.
+
+        When called with an event, the result will invoke <dispatch> with
+        the event and a callable that calls <handler> with <args>.  It is
+        then passed through any functions registered using
+        addDispatchWrapper().  The number and size of the handlers made for
+        the parent are recorded for memory accounting; the handlers
+        themselves are not kept, as that would make reference cycles.
+
+        If the parent's _useWeakHandlers attribute is true, the handler and
+        arguments are only weakly referenced.  Once they have died, events
+        are skipped rather than dispatched.
+        """
+        if parent._useWeakHandlers:
+            handler = wcurry(handler,*args)
+            handler = lcurry(_EvtHandleIfAlive,dispatch,handler)
+        else:
+            if args:
+                handler = lcurry(handler,*args)
+            handler = lcurry(dispatch,handler)
+        for wrapper in _dispatchWrappers:
+            handler = wrapper(handler,parent,cName,self.action)
+        parent._handlerCount += 1
+        parent._handlerBytes += memory.sizeOf(handler)
+        return handler
     
 
 class ChangeConnector(Connector):
@@ -55,59 +91,81 @@ class ChangeConnector(Connector):
     to the control itself as its only argument.
     """
 
+    action = "change"
+
     _cons_entries = ("wxTextCtrl","wxCheckBox","wxListBox",
                      "wxComboBox","wxRadioBox","wxChoice",
-                     "wxSlider")
+                     "wxSlider","wxSpinCtrl","wxSpinButton",
+                     "wxRadioButton","wxToggleButton")
     
     def connect_wxTextCtrl(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandleAndSkip,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandleAndSkip,
+                                    handler,child)
         wx.EVT_TEXT_ENTER(parent,child.GetId(),handler)
         wx.EVT_KILL_FOCUS(child,handler)
         return True
     
     def connect_wxCheckBox(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_CHECKBOX(parent,parent.getChildId(cName),handler)
         return True
         
     def connect_wxListBox(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_LISTBOX(parent,parent.getChildId(cName),handler)
         return True
         
     def connect_wxComboBox(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
-        wx.EVT_COMBOBOX(parent,parent.getChildId(cName),handler)
-        wx.EVT_TEXT_ENTER(parent,parent.getChildId(cName),handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
+        cID = parent.getChildId(cName)
+        wx.EVT_COMBOBOX(parent,cID,handler)
+        wx.EVT_TEXT_ENTER(parent,cID,handler)
         return True
         
     def connect_wxRadioBox(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_RADIOBOX(parent,parent.getChildId(cName),handler)
         return True
         
     def connect_wxChoice(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_CHOICE(parent,parent.getChildId(cName),handler)
         return True
         
     def connect_wxSlider(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
-	child.Bind(wx.EVT_SCROLL,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
+        child.Bind(wx.EVT_SCROLL,handler)
+        return True
+        
+    def connect_wxSpinCtrl(self,cName,parent,handler):
+        child = parent.getChild(cName)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
+        wx.EVT_SPINCTRL(parent,parent.getChildId(cName),handler)
+        return True
+        
+    def connect_wxSpinButton(self,cName,parent,handler):
+        child = parent.getChild(cName)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
+        wx.EVT_SPIN(parent,parent.getChildId(cName),handler)
+        return True
+        
+    def connect_wxRadioButton(self,cName,parent,handler):
+        child = parent.getChild(cName)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
+        wx.EVT_RADIOBUTTON(parent,parent.getChildId(cName),handler)
+        return True
+        
+    def connect_wxToggleButton(self,cName,parent,handler):
+        child = parent.getChild(cName)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
+        wx.EVT_TOGGLEBUTTON(parent,parent.getChildId(cName),handler)
         return True
 
 
@@ -120,6 +178,8 @@ class ContentConnector(Connector):
     only argument, and return the newly created content for that
     child widget.
     """
+
+    action = "content"
     
     def connect(self,cName,parent,handler):
         child = parent.getChild(cName)
@@ -137,56 +197,164 @@ class ActivateConnector(Connector):
     control itself as a default argument, passed depending on the type
     of the control.
     """
+
+    action = "activate"
     
     _cons_entries = ("wxButton","wxBitmapButton","wxCheckBox",
                      "wxMenuItem", "tool","wxListBox")
     
     def connect_wxButton(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_BUTTON(parent,child.GetId(),handler)
         return True
         
     def connect_wxBitmapButton(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_BUTTON(parent,child.GetId(),handler)
         return True
         
     def connect_wxCheckBox(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_CHECKBOX(parent,child.GetId(),handler)
         return True
         
     def connect_wxMenuItem(self,cName,parent,handler):
-        handler = lcurry(_EvtHandleWithEvt,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandleWithEvt,handler)
         cID = parent.getChildId(cName)
         wx.EVT_MENU(parent,cID,handler)
         return True
     
     def connect_tool(self,cName,parent,handler):
-        handler = lcurry(_EvtHandleWithEvt,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandleWithEvt,handler)
         wx.EVT_MENU(parent,parent.getChildId(cName),handler)
         return True
         
     def connect_wxListBox(self,cName,parent,handler):
         child = parent.getChild(cName)
-        handler = lcurry(handler,child)
-        handler = lcurry(_EvtHandle,handler)
+        handler = self._makeHandler(cName,parent,_EvtHandle,handler,child)
         wx.EVT_LISTBOX_DCLICK(parent,parent.getChildId(cName),handler)
         return True
 
 
+class UpdateUIConnector(Connector):
+    """Connector handling the 'updateui' event.
+    This event is fired by wx when the application is idle, or when a menu
+    is about to be shown, to give the program a chance to update the state
+    of a menu item, tool or control.  The handler must expect the
+    wx.UpdateUIEvent as its only argument, and may call its methods such
+    as Enable() or Check() to change the state of the child.
+
+    Each window that is connected is marked to receive update-UI events
+    even when wx is only sending them to windows that ask for them.  Use
+    configureUpdateUI() to choose this mode, and to limit how often the
+    events are sent.
+    """
+
+    action = "updateui"
+
+    _cons_entries = ("wxMenuItem","tool","wxButton","wxBitmapButton",
+                     "wxToggleButton","wxCheckBox","wxRadioButton",
+                     "wxTextCtrl","wxComboBox","wxChoice","wxListBox",
+                     "wxRadioBox","wxSlider","wxSpinCtrl","wxStaticText",
+                     "wxPanel","wxNotebook")
+
+    def connect_wxMenuItem(self,cName,parent,handler):
+        # Menu items are updated by the frame owning the menu bar
+        handler = self._makeHandler(cName,parent,_EvtHandleWithEvt,handler)
+        wx.EVT_UPDATE_UI(parent,parent.getChildId(cName),handler)
+        _processUIUpdates(parent.GetTopLevelParent())
+        return True
+
+    def connect_tool(self,cName,parent,handler):
+        # Tools are updated by the toolbar containing them
+        tool = parent.getChild(cName)
+        handler = self._makeHandler(cName,parent,_EvtHandleWithEvt,handler)
+        wx.EVT_UPDATE_UI(parent,parent.getChildId(cName),handler)
+        _processUIUpdates(tool.GetToolBar())
+        return True
+
+    def connect_wxButton(self,cName,parent,handler):
+        child = parent.getChild(cName)
+        handler = self._makeHandler(cName,parent,_EvtHandleWithEvt,handler)
+        wx.EVT_UPDATE_UI(parent,child.GetId(),handler)
+        _processUIUpdates(child)
+        return True
+
+    connect_wxBitmapButton = connect_wxButton
+    connect_wxToggleButton = connect_wxButton
+    connect_wxCheckBox = connect_wxButton
+    connect_wxRadioButton = connect_wxButton
+    connect_wxTextCtrl = connect_wxButton
+    connect_wxComboBox = connect_wxButton
+    connect_wxChoice = connect_wxButton
+    connect_wxListBox = connect_wxButton
+    connect_wxRadioBox = connect_wxButton
+    connect_wxSlider = connect_wxButton
+    connect_wxSpinCtrl = connect_wxButton
+    connect_wxStaticText = connect_wxButton
+    connect_wxPanel = connect_wxButton
+    connect_wxNotebook = connect_wxButton
+
+
+def _processUIUpdates(window):
+    """Mark <window> to receive update-UI events in specified-only mode."""
+    if window is not None:
+        style = window.GetExtraStyle()
+        window.SetExtraStyle(style | wx.WS_EX_PROCESS_UI_UPDATES)
+
+
+def configureUpdateUI(interval=NotGiven,specifiedOnly=NotGiven):
+    """Control how often and to which windows update-UI events are sent.
+
+    These settings apply to the whole application.  If <interval> is given,
+    update-UI events are sent at most once every <interval> milliseconds,
+    rather than every time the application is idle; -1 stops them being
+    sent at all.  If <specifiedOnly> is true, the events are only sent to
+    windows that have asked for them, which includes all windows with an
+    'updateui' magic method connected.  If false, they are sent to every
+    window, which is the wx default.
+    """
+    if interval is not NotGiven:
+        wx.UpdateUIEvent.SetUpdateInterval(interval)
+    if specifiedOnly is not NotGiven:
+        if specifiedOnly:
+            wx.UpdateUIEvent.SetMode(wx.UPDATE_UI_PROCESS_SPECIFIED)
+        else:
+            wx.UpdateUIEvent.SetMode(wx.UPDATE_UI_PROCESS_ALL)
+
+
+# Functions wrapping every handler made by Connector._makeHandler()
+_dispatchWrappers = []
+
+def addDispatchWrapper(wrapper):
+    """Wrap all subsequently connected event handlers using <wrapper>.
+
+    The wrapper will be called as wrapper(handler,parent,cName,action),
+    where <handler> is the callable that would otherwise be connected to
+    the event, <parent> is the XRCWidget, <cName> the name of the child
+    and <action> the name of the action.  It must return a callable to
+    be connected in its place.  Handlers that have already been connected
+    are not affected.
+    """
+    if wrapper not in _dispatchWrappers:
+        _dispatchWrappers.append(wrapper)
+
+def removeDispatchWrapper(wrapper):
+    """Stop wrapping subsequently connected handlers using <wrapper>."""
+    if wrapper in _dispatchWrappers:
+        _dispatchWrappers.remove(wrapper)
+
+
 def getConnectors():
     """Construct and return dictionary of connectors."""
     cons = {}
     cons["change"] = ChangeConnector()
     cons["content"] = ContentConnector()
     cons["activate"] = ActivateConnector()
+    cons["updateui"] = UpdateUIConnector()
     return cons
     
 
@@ -216,5 +384,15 @@ def _EvtHandleAndSkip(toCall,evnt):
     toCall()
     evnt.Skip()
 
+def _EvtHandleIfAlive(dispatch,toCall,evnt):
+    """Handle an event by passing it to <dispatch> if <toCall> is alive.
+    <toCall> must be a wcurry.  If it is dead, the event is skipped so
+    that other handlers may process it.
+    """
+    if toCall.alive():
+        dispatch(toCall,evnt)
+    else:
+        evnt.Skip()
+
         
         
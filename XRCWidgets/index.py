@@ -0,0 +1,193 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.index:  Lookup tables derived from parsed XRC resources
+
+Walking the XMLDocTree of an XRC file is cheap enough to do once, but not
+every time a widget needs to know something about its children.  This module
+provides the XRCIndex class, which summarises a single resource from an XRC
+file into flat lookup tables.  Indexes are shared between all widgets loaded
+from the same resource, and are obtained using the getIndex() function.
+
+"""
+
+from XRCWidgets.utils import XMLElementData, LRUCache
+from XRCWidgets import memory
+
+
+class XRCIndex:
+    """Lookup tables describing a single resource from an XRC file.
+
+    The following attributes are available:
+
+        * names:    list of the names of all named objects in the resource,
+                    in document order
+        * types:    dictionary mapping object names to their XRC class
+        * parents:  dictionary mapping object names to the name of their
+                    closest named ancestor object, or None if there is none
+        * tools:    dictionary mapping the names of toolbar tools to the
+                    name of their toolbar, or None if it is unnamed
+        * pages:    dictionary mapping the names of notebook pages to a
+                    tuple (<notebook name>,<page index>)
+
+    A table of numeric IDs for each named object that the XRC loader gives
+    an ID to is also available from getIds().
+    """
+
+    # Attributes containing the lookup tables, as used by getTables()
+    _tables = ("names","types","parents","tools","pages")
+
+    def __init__(self,xmltree,rName):
+        """XRCIndex initialiser.
+        <xmltree> must be the XMLDocTree for the XRC file, and <rName> the
+        name of the resource to be indexed.  If no such resource exists,
+        the entire file is indexed.  If <xmltree> is None, the index is
+        left empty.
+        """
+        self.names = []
+        self.types = {}
+        self.parents = {}
+        self.tools = {}
+        self.pages = {}
+        self._ids = None
+        if xmltree is None:
+            return
+        root = xmltree.elements.get(rName,xmltree.root)
+        for data in iterElements(root):
+            if data.name != "object":
+                continue
+            try:
+                nm = data.attrs["name"]
+            except KeyError:
+                continue
+            cls = data.attrs.get("class")
+            self.names.append(nm)
+            self.types[nm] = cls
+            self.parents[nm] = _parentName(data)
+            if cls == "tool":
+                self.tools[nm] = data.parent.attrs.get("name")
+            elif cls in _PAGE_CLASSES:
+                bookNm = data.parent.attrs.get("name")
+                if bookNm is not None:
+                    self.pages[nm] = (bookNm,_pageIndex(data))
+
+    def getTables(self):
+        """Get the lookup tables as a dictionary of builtin python types.
+
+        This dictionary may be passed to fromTables() to recreate the index,
+        so it can be stored to avoid parsing the XRC file.
+        """
+        return dict([(nm,getattr(self,nm)) for nm in self._tables])
+
+    @classmethod
+    def fromTables(cls,tables):
+        """Create an XRCIndex from the output of getTables()."""
+        idx = cls(None,None)
+        for nm in cls._tables:
+            setattr(idx,nm,tables[nm])
+        return idx
+
+    def getIds(self,makeId):
+        """Get a dictionary mapping object names to their numeric IDs.
+
+        The first time this is called, <makeId> (typically xrc.XRCID) is
+        called with each name to find its ID.  Only objects of classes that
+        the XRC loader gives IDs to are included (see hasId()), so no IDs
+        are allocated beyond those the loader allocated itself.
+        """
+        if self._ids is None:
+            self._ids = dict([(nm,makeId(nm)) for nm in self.names
+                                              if hasId(self.types[nm])])
+        return self._ids
+
+    def namesOfType(self,types):
+        """Get the names of all objects whose class is in <types>.
+
+        The names are returned as a list in document order.
+        """
+        return [nm for nm in self.names if self.types[nm] in types]
+
+
+# XRC classes describing a page of a notebook-like widget
+_PAGE_CLASSES = ("notebookpage","listbookpage","choicebookpage",
+                 "treebookpage","toolbookpage")
+
+
+# XRC classes of named objects that the XRC loader does not give IDs to.
+# Sizers, whose classes end in "Sizer", are not given IDs either.  Menus
+# are given IDs only when they are submenus, but are always found by label.
+_NO_ID_CLASSES = ("sizeritem","spacer","wxMenu","wxMenuBar") + _PAGE_CLASSES
+
+def hasId(cls):
+    """Check whether the XRC loader gives objects of class <cls> an ID."""
+    if cls is None or cls in _NO_ID_CLASSES:
+        return False
+    return not cls.endswith("Sizer")
+
+
+def _parentName(data):
+    """Get the name of the closest named object above <data>, if any."""
+    data = data.parent
+    while data is not None:
+        if data.name == "object":
+            try:
+                return data.attrs["name"]
+            except KeyError:
+                pass
+        data = data.parent
+    return None
+
+
+def _pageIndex(data):
+    """Get the index of the notebook page described by <data>."""
+    idx = 0
+    for c in data.parent.children:
+        if c is data:
+            return idx
+        if isinstance(c,XMLElementData):
+            if c.attrs.get("class") in _PAGE_CLASSES:
+                idx += 1
+    return idx
+
+
+def iterElements(root):
+    """Iterator over <root> and all XMLElementData objects below it.
+
+    Elements are produced in document order.  The iteration does not
+    recurse, so arbitrarily deep trees may be safely traversed.
+    """
+    stack = [root]
+    while stack:
+        data = stack.pop()
+        yield data
+        chldrn = [c for c in data.children if isinstance(c,XMLElementData)]
+        chldrn.reverse()
+        stack.extend(chldrn)
+
+
+# Indexes are shared between all widgets loaded from the same resource,
+# keyed by (XRC file location, resource name).
+_indexes = memory.registerCache("index",LRUCache(sizeof=memory.sizeOfValue))
+
+def getIndex(fileNm,rName,makeTree):
+    """Get the XRCIndex for resource <rName> from the XRC file <fileNm>.
+
+    If the index has not already been built, <makeTree> will be called
+    without arguments to obtain the XMLDocTree for the file.
+    """
+    key = (fileNm,rName)
+    try:
+        return _indexes[key]
+    except KeyError:
+        pass
+    idx = XRCIndex(makeTree(),rName)
+    _indexes[key] = idx
+    return idx
+
+
+def addIndex(fileNm,rName,idx):
+    """Provide a pre-built XRCIndex for resource <rName> of file <fileNm>."""
+    _indexes[(fileNm,rName)] = idx
+
@@ -0,0 +1,214 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.memory:  Accounting for memory used by XRCWidgets
+
+This module keeps track of the caches maintained by the XRCWidgets toolkit
+and of the XRCWidget instances that are currently alive, so that the memory
+they use can be reported and controlled.  The main functions are:
+
+    * getUsage():         report memory used by caches and widget classes
+    * getInstanceUsage(): report memory used by a single widget
+    * setCacheLimits():   limit the size of one or all of the caches
+    * checkLeaks():       check for widgets kept alive after being destroyed
+
+Sizes are estimates, calculated from the python objects owned by XRCWidgets.
+Memory held by wxWidgets itself is not included, except that loaded wx
+resources are assumed to be about as large as the XRC data they came from.
+
+"""
+
+import sys
+import gc
+import weakref
+
+from XRCWidgets import XRCWidgetsError, NotGiven
+
+
+# All caches kept by the toolkit, keyed by name
+_caches = {}
+
+# All XRCWidget instances that are currently alive, mapped to their class.
+# wxPython changes the class of widgets once they are destroyed, so the
+# original is needed to report leaks.
+_instances = weakref.WeakKeyDictionary()
+
+# Modules whose objects are treated as plain data by sizeOf()
+_DATA_MODULES = ("XRCWidgets.utils","XRCWidgets.index")
+
+
+def registerCache(name,cache):
+    """Register an LRUCache with the given name, and return it."""
+    _caches[name] = cache
+    return cache
+
+
+def trackInstance(widget):
+    """Include the given widget in future usage reports."""
+    try:
+        _instances[widget] = widget.__class__
+    except TypeError:
+        pass
+
+
+def getCaches():
+    """Get a dictionary mapping names to registered caches."""
+    return dict(_caches)
+
+
+def setCacheLimits(name=None,maxEntries=NotGiven,maxBytes=NotGiven):
+    """Set limits on the size of the named cache.
+
+    If <name> is None, the limits are applied to every registered cache.
+    Limits that are not given are left unchanged, while a limit of None
+    removes any existing limit.  Entries are evicted immediately if the
+    new limits require it.
+    """
+    if name is None:
+        caches = _caches.values()
+    else:
+        caches = [_caches[name]]
+    for cache in caches:
+        if maxEntries is NotGiven:
+            mE = cache.maxEntries
+        else:
+            mE = maxEntries
+        if maxBytes is NotGiven:
+            mB = cache.maxBytes
+        else:
+            mB = maxBytes
+        cache.setLimits(mE,mB)
+
+
+def clearCaches():
+    """Remove all entries from all registered caches."""
+    for cache in _caches.values():
+        cache.clear()
+
+
+def getUsage():
+    """Report the memory used by XRCWidgets.
+
+    The report is a dictionary with the following keys:
+
+        * caches:   maps cache names to a dictionary of statistics for that
+                    cache; its entries, bytes, limits, hits, misses and
+                    evictions
+        * classes:  maps names of XRCWidget classes to a dictionary giving
+                    the number of live instances of that class, and the
+                    total bytes used by each category of data they own
+
+    """
+    caches = {}
+    for (name,cache) in _caches.items():
+        caches[name] = {
+            "entries": len(cache),
+            "bytes": cache.bytes,
+            "maxEntries": cache.maxEntries,
+            "maxBytes": cache.maxBytes,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "evictions": cache.evictions,
+        }
+    classes = {}
+    for (widget,cls) in list(_instances.items()):
+        if not widget:
+            continue
+        clsNm = "%s.%s" % (cls.__module__,cls.__name__)
+        clsUsage = classes.setdefault(clsNm,{"instances": 0})
+        clsUsage["instances"] += 1
+        for (category,size) in getInstanceUsage(widget).items():
+            clsUsage[category] = clsUsage.get(category,0) + size
+    return {"caches": caches, "classes": classes}
+
+
+def getInstanceUsage(widget):
+    """Report the memory used by a single XRCWidget instance.
+
+    The report is a dictionary mapping categories of data owned by the
+    widget (for example "xmltree" or "handlers") to their size in bytes.
+    The key "total" gives the sum over all categories.  Shared data such
+    as indexes and cached resources are counted by getUsage() instead.
+    """
+    usage = {}
+    total = 0
+    for (category,obj) in widget._getOwnedData().items():
+        size = sizeOf(obj)
+        usage[category] = size
+        total += size
+    getSizes = getattr(widget,"_getOwnedSizes",None)
+    if getSizes is not None:
+        for (category,size) in getSizes().items():
+            usage[category] = usage.get(category,0) + size
+            total += size
+    usage["total"] = total
+    return usage
+
+
+def sizeOfValue(key,value):
+    """Estimate the size of a cache entry, for use as an LRUCache sizeof."""
+    return sizeOf(value)
+
+
+def sizeOf(obj):
+    """Estimate the memory used by <obj> and everything it refers to.
+
+    Builtin containers are followed, as are the attributes of objects from
+    the modules in _DATA_MODULES.  Other objects (such as wx widgets) are
+    counted but not followed.  Objects reachable by several paths are only
+    counted once.
+    """
+    total = 0
+    seen = set()
+    todo = [obj]
+    while todo:
+        o = todo.pop()
+        if o is None or id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o,0)
+        if isinstance(o,dict):
+            todo.extend(o.keys())
+            todo.extend(o.values())
+        elif isinstance(o,(list,tuple,set,frozenset)):
+            todo.extend(o)
+        elif getattr(o.__class__,"__module__",None) in _DATA_MODULES:
+            d = getattr(o,"__dict__",None)
+            if d is not None:
+                todo.append(d)
+    return total
+
+
+
+def findLeakedWidgets():
+    """Find XRCWidget instances that are alive after being destroyed.
+
+    A garbage collection is performed first, so only widgets that are still
+    referenced from somewhere are returned.  Once wx has destroyed a widget
+    its python object will test false, so any such objects found in our
+    record of live instances have been leaked.
+    """
+    gc.collect()
+    leaked = []
+    for widget in list(_instances.keys()):
+        if not widget:
+            leaked.append(widget)
+    return leaked
+
+
+def checkLeaks():
+    """Raise XRCWidgetsError if any destroyed widgets are still alive.
+
+    This is intended to be called from tests after destroying the widgets
+    they create.  The error message gives the number of leaked instances
+    of each class.
+    """
+    counts = {}
+    for widget in findLeakedWidgets():
+        clsNm = _instances[widget].__name__
+        counts[clsNm] = counts.get(clsNm,0) + 1
+    if counts:
+        leaks = ["%s (%d)" % item for item in sorted(counts.items())]
+        raise XRCWidgetsError("Leaked widgets: " + ", ".join(leaks))
@@ -0,0 +1,199 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.monitor:  Latency monitoring for magic-method event handlers
+
+This module can time every event handler connected by the XRCWidgets
+connectors, i.e. the "magic methods" named like on_<name>_<action>.  For
+each handler it keeps a count of calls, the total and maximum time taken,
+and a histogram of call latencies.  Any call that takes longer than a given
+threshold is reported when it happens.
+
+Monitoring must be enabled before the widgets of interest are created, as
+only handlers connected while it is enabled are timed:
+
+    from XRCWidgets import monitor
+    monitor.enable(threshold=0.05)
+    ...
+    monitor.getMonitor().report()
+
+The overhead is two calls to a timer and a few dictionary operations per
+event, so it is cheap enough to leave enabled in production.
+
+"""
+
+import sys
+import time
+import logging
+from bisect import bisect_left
+
+# The most precise clock available, for timing handlers
+if hasattr(time,"perf_counter"):
+    timer = time.perf_counter
+elif sys.platform == "win32":
+    timer = time.clock
+else:
+    timer = time.time
+
+log = logging.getLogger("XRCWidgets.monitor")
+
+
+# Upper bounds of the histogram buckets, in seconds.  A final bucket
+# holds all calls slower than the last bound.
+BUCKETS = (0.001,0.002,0.005,0.01,0.02,0.05,0.1,0.2,0.5,1.0,2.0,5.0)
+
+
+class HandlerStats:
+    """Statistics about the calls made to a single handler.
+
+    The attributes are 'count', 'total' and 'max', along with 'histogram'
+    which is a list giving the number of calls falling into each of the
+    buckets defined by BUCKETS.  Times are in seconds.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+
+    def record(self,elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.histogram[bisect_left(BUCKETS,elapsed)] += 1
+
+
+class HandlerMonitor:
+    """Collects latency statistics for event handlers.
+
+    Statistics are kept per handler, identified by a tuple of the widget
+    class name, child name and action.  If <threshold> is not None, calls
+    taking longer than that many seconds are passed to onSlow(), which by
+    default logs a warning to the "XRCWidgets.monitor" logger.
+    """
+
+    def __init__(self,threshold=0.1):
+        self.threshold = threshold
+        self.stats = {}
+
+    def wrap(self,handler,parent,cName,action):
+        """Wrap <handler> so that its calls are timed.
+
+        This has the signature expected by connectors.addDispatchWrapper().
+        The wrapper does not reference <parent> so that it doesn't keep the
+        widget alive.
+        """
+        key = (parent.__class__.__name__,cName,action)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = HandlerStats()
+        return _TimedHandler(self,handler,key,stats)
+
+    def onSlow(self,key,elapsed):
+        """Called when a handler exceeds the threshold time."""
+        eStr = "Slow handler: %s.on_%s_%s took %.1fms"
+        log.warning(eStr,key[0],key[1],key[2],elapsed*1000)
+
+    def getStats(self):
+        """Get the statistics for each handler that has been called.
+
+        A dictionary is returned mapping (class name,child name,action)
+        tuples to dictionaries with keys count, total, mean, max and
+        histogram.
+        """
+        result = {}
+        for (key,stats) in self.stats.items():
+            if stats.count == 0:
+                continue
+            result[key] = {"count": stats.count,
+                           "total": stats.total,
+                           "mean": stats.total / stats.count,
+                           "max": stats.max,
+                           "histogram": list(stats.histogram)}
+        return result
+
+    def reset(self):
+        """Discard all statistics collected so far."""
+        for stats in self.stats.values():
+            stats.__init__()
+
+    def report(self,stream=None):
+        """Write a summary of the collected statistics to <stream>.
+
+        Handlers are listed in order of decreasing total time.  If <stream>
+        is not given, sys.stderr is used.
+        """
+        if stream is None:
+            stream = sys.stderr
+        stats = self.getStats()
+        order = sorted(stats.keys(),key=lambda k: -stats[k]["total"])
+        stream.write("%-50s %8s %10s %10s %10s\n" % ("handler","calls",
+                                                    "total ms","mean ms",
+                                                    "max ms"))
+        for key in order:
+            s = stats[key]
+            name = "%s.on_%s_%s" % key
+            stream.write("%-50s %8d %10.1f %10.2f %10.2f\n" % (name,
+                         s["count"],s["total"]*1000,s["mean"]*1000,
+                         s["max"]*1000))
+
+
+class _TimedHandler:
+    """Event handler that records the time taken by another handler."""
+
+    def __init__(self,monitor,handler,key,stats):
+        self.monitor = monitor
+        self.handler = handler
+        self.key = key
+        self.stats = stats
+
+    def __call__(self,*args,**kwds):
+        start = timer()
+        try:
+            return self.handler(*args,**kwds)
+        finally:
+            elapsed = timer() - start
+            self.stats.record(elapsed)
+            threshold = self.monitor.threshold
+            if threshold is not None and elapsed > threshold:
+                self.monitor.onSlow(self.key,elapsed)
+
+
+# The monitor currently in use, if any
+_monitor = None
+
+def enable(threshold=0.1,monitor=None):
+    """Start timing subsequently connected event handlers.
+
+    A new HandlerMonitor is created with the given threshold, unless an
+    existing <monitor> is given.  The monitor in use is returned.
+    """
+    global _monitor
+    from XRCWidgets import connectors
+    disable()
+    if monitor is None:
+        monitor = HandlerMonitor(threshold)
+    _monitor = monitor
+    connectors.addDispatchWrapper(monitor.wrap)
+    return monitor
+
+def disable():
+    """Stop timing subsequently connected event handlers.
+
+    Handlers that have already been connected continue to be timed, and
+    the statistics remain available from the monitor.
+    """
+    global _monitor
+    if _monitor is not None:
+        from XRCWidgets import connectors
+        connectors.removeDispatchWrapper(_monitor.wrap)
+        _monitor = None
+
+def getMonitor():
+    """Get the monitor currently in use, or None if monitoring is disabled."""
+    return _monitor
+
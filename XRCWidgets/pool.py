@@ -0,0 +1,213 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.pool:  Pre-built instances of dialogs and frames
+
+Creating an XRCDialog or XRCFrame means loading its resource and connecting
+its event handlers, which can cause a noticeable pause when done in response
+to a click.  This module keeps pools of hidden instances, which are built
+when the application is idle and handed out when they are needed:
+
+    pool.register(AboutDialog,args=(mainFrame,))
+    ...
+    dlg = pool.acquire(AboutDialog)
+    dlg.ShowModal()
+
+When a pooled widget is closed or destroyed it is hidden, reset, and
+returned to its pool instead, unless the close is vetoed by one of its own
+EVT_CLOSE handlers.  A pooled dialog is also returned once ShowModal() has
+returned and the event that called it has been handled, so its values can
+still be read after ShowModal() returns.  Its children have their values restored to
+those they had when it was created, and its on_release() method is called.
+Each time it is handed out, its on_acquire() method is called with the
+arguments given to acquire(), for any per-use setup.
+
+"""
+
+import wx
+
+from XRCWidgets import XRCWidgetsError
+
+
+class WidgetPool:
+    """Pool of pre-built instances of an XRCWidget class.
+
+    Instances are created by calling <cls>(*<args>,**<kwds>).  The pool
+    manages up to <size> of them, counting both those kept ready and those
+    handed out, so a released instance can always be kept for reuse unless
+    more than <size> were in use at once.  More can be handed out, but any
+    beyond <size> are really destroyed when they are released.  The pool
+    is only refilled in idle time while it has fewer than <size>.
+    """
+
+    def __init__(self,cls,args=(),kwds=None,size=1):
+        self.cls = cls
+        self.args = args
+        if kwds is None:
+            kwds = {}
+        self.kwds = kwds
+        self.size = size
+        self._ready = []
+        self._inUse = []
+
+    def prewarm(self):
+        """Fill the pool with instances when the application is next idle."""
+        if self not in _prewarming:
+            _prewarming.append(self)
+        _bindIdle()
+
+    def isFull(self):
+        self._ready = [w for w in self._ready if w]
+        self._inUse = [w for w in self._inUse if w]
+        return len(self._ready) + len(self._inUse) >= self.size
+
+    def create(self):
+        """Create a new instance managed by this pool."""
+        widget = self.cls(*self.args,**self.kwds)
+        widget.Hide()
+        widget._setWidgetPool(self)
+        return widget
+
+    def acquire(self,*args,**kwds):
+        """Hand out an instance, creating one if none are ready.
+
+        The instance's on_acquire() method is called with the given
+        arguments before it is returned.  If the pool is still below its
+        size, it is refilled in idle time.
+        """
+        widget = None
+        while self._ready and not widget:
+            widget = self._ready.pop()
+        if not widget:
+            widget = self.create()
+        self._inUse.append(widget)
+        widget.on_acquire(*args,**kwds)
+        if not self.isFull():
+            self.prewarm()
+        return widget
+
+    def release(self,widget):
+        """Return a widget to the pool.
+
+        The widget is hidden and reset.  If the pool is already full, it is
+        not reset and False is returned, in which case the caller should
+        destroy it.
+        """
+        if widget in self._ready:
+            return True
+        if widget in self._inUse:
+            self._inUse.remove(widget)
+        widget.Hide()
+        if self.isFull():
+            return False
+        widget._resetPooled()
+        self._ready.append(widget)
+        return True
+
+    def clear(self):
+        """Destroy all ready instances.
+
+        Instances that have been handed out are no longer managed by the
+        pool, and are really destroyed when they are released.
+        """
+        for widget in self._inUse:
+            if widget:
+                widget._widgetPool = None
+        self._inUse = []
+        ready = self._ready
+        self._ready = []
+        for widget in ready:
+            if widget:
+                widget._widgetPool = None
+                widget.Destroy()
+
+
+# Pools registered for each class
+_pools = {}
+
+def register(cls,args=(),kwds=None,size=1):
+    """Keep up to <size> pre-built instances of <cls> ready for use.
+
+    Instances are created with <cls>(*<args>,**<kwds>) in idle time.  Any
+    existing pool for the class is replaced.  The new WidgetPool is
+    returned.
+    """
+    unregister(cls)
+    widgetPool = WidgetPool(cls,args,kwds,size)
+    _pools[cls] = widgetPool
+    widgetPool.prewarm()
+    return widgetPool
+
+def unregister(cls):
+    """Stop pooling instances of <cls>, destroying any that are ready."""
+    widgetPool = _pools.pop(cls,None)
+    if widgetPool is not None:
+        if widgetPool in _prewarming:
+            _prewarming.remove(widgetPool)
+        widgetPool.clear()
+
+def unregisterAll():
+    """Stop pooling instances of every class."""
+    for cls in list(_pools.keys()):
+        unregister(cls)
+
+def getPool(cls):
+    """Get the WidgetPool registered for <cls>, or None."""
+    return _pools.get(cls)
+
+def acquire(cls,*args,**kwds):
+    """Get an instance of <cls> from its pool.
+
+    If no pool is registered for the class, a new instance is simply
+    created with the given arguments instead.
+    """
+    widgetPool = _pools.get(cls)
+    if widgetPool is None:
+        return cls(*args,**kwds)
+    return widgetPool.acquire(*args,**kwds)
+
+
+########
+##
+##  Creation of instances in idle time
+##
+########
+
+# Pools that are not yet full
+_prewarming = []
+
+# The application our idle handler is bound to, if any
+_idleApp = []
+
+def _bindIdle():
+    if not _idleApp:
+        app = wx.GetApp()
+        if app is None:
+            raise XRCWidgetsError("Widgets can't be pooled without a wx.App")
+        app.Bind(wx.EVT_IDLE,_onIdle)
+        _idleApp.append(app)
+
+def _unbindIdle():
+    if _idleApp:
+        app = _idleApp.pop()
+        if app:
+            app.Unbind(wx.EVT_IDLE,handler=_onIdle)
+
+def _onIdle(evt):
+    """Create one pooled instance each time the application is idle.
+
+    Creating a single instance keeps each pause short, and more idle
+    events are requested until every pool is full.
+    """
+    evt.Skip()
+    while _prewarming and _prewarming[0].isFull():
+        del _prewarming[0]
+    if not _prewarming:
+        _unbindIdle()
+        return
+    widgetPool = _prewarming[0]
+    widgetPool._ready.append(widgetPool.create())
+    evt.RequestMore()
+
@@ -0,0 +1,411 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.replay:  Record and replay the events handled by magic methods
+
+This module can record every event dispatched to a handler connected by the
+XRCWidgets connectors, i.e. the "magic methods" named like on_<name>_<action>.
+For each event it records the time, the class of the widget and its number
+among the instances of that class, the child name and action, and the value
+of the child if it has one.  Recording must be started before the widgets of
+interest are created:
+
+    from XRCWidgets import replay
+    replay.record()
+    ...
+    replay.stopRecording("session.events")
+
+The recorded stream can later be fed back into the same widgets, for
+example in a test run under a virtual display.  The replayer must also be
+installed before the widgets are created, so that it can find the handlers
+they connect; widgets are matched to the recording by class name and by
+the order in which their handlers were first connected:
+
+    replayer = replay.install()
+    frame = MainFrame(None)
+    replayer.replay(replay.loadEvents("session.events"))
+    replayer.report()
+
+Before each event is replayed, the recorded value is given to the child
+using setValues().  The connected handler is then called directly with a
+ReplayEvent, which stands in for the original wx event, and is timed.  This
+makes slow sessions from the field into repeatable benchmarks.
+
+"""
+
+import sys
+import json
+
+from XRCWidgets import XRCWidgetsError, NotGiven
+from XRCWidgets.utils import makeRef
+from XRCWidgets.monitor import HandlerStats, timer
+
+
+EVENTS_VERSION = 1
+
+
+class _Instances:
+    """Numbers the instances of each widget class in order of first use.
+
+    Only weak references to the widgets are kept, where possible.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._numbers = {}
+        self._widgets = {}
+
+    def number(self,widget):
+        """Get the number of <widget> among the instances of its class."""
+        entry = self._numbers.get(id(widget))
+        if entry is not None and entry[0]() is widget:
+            return entry[1]
+        clsName = widget.__class__.__name__
+        num = self._counts.get(clsName,0)
+        self._counts[clsName] = num + 1
+        ref = makeRef(widget)
+        self._numbers[id(widget)] = (ref,num)
+        self._widgets[(clsName,num)] = ref
+        return num
+
+    def find(self,clsName,num):
+        """Get instance <num> of the named class, or None."""
+        ref = self._widgets.get((clsName,num))
+        if ref is None:
+            return None
+        return ref()
+
+
+def _getValue(widget,cName):
+    """Get the value of the named child, or NotGiven if it has none."""
+    try:
+        getter = widget._getValueAccessors(cName)[0]
+        return getattr(widget.getChild(cName),getter)()
+    except XRCWidgetsError:
+        return NotGiven
+
+
+########
+##
+##  Recording of events
+##
+########
+
+
+class EventRecorder:
+    """Records the events dispatched to magic-method handlers.
+
+    Events for the actions listed in <ignoredActions> are not recorded.
+    By default these are the "updateui" events, which are sent by wx
+    itself rather than in response to the user.
+    """
+
+    ignoredActions = ("updateui",)
+
+    def __init__(self):
+        self.started = timer()
+        self.events = []
+        self._instances = _Instances()
+
+    def wrap(self,handler,parent,cName,action):
+        """Wrap <handler> so that its calls are recorded.
+
+        This has the signature expected by connectors.addDispatchWrapper().
+        """
+        if action in self.ignoredActions:
+            return handler
+        num = self._instances.number(parent)
+        return _RecordingHandler(self,handler,makeRef(parent),
+                                 (parent.__class__.__name__,num,cName,action))
+
+    def onEvent(self,key,widget):
+        """Called when a recorded handler is about to be dispatched."""
+        event = {"time": timer() - self.started,
+                 "widget": key[0], "instance": key[1],
+                 "child": key[2], "action": key[3]}
+        if widget is not None:
+            value = _getValue(widget,key[2])
+            if value is not NotGiven:
+                event["value"] = value
+        self.events.append(event)
+
+    def save(self,path):
+        """Save the recorded events to the file at <path>."""
+        f = open(path,"w")
+        try:
+            json.dump({"version": EVENTS_VERSION, "events": self.events},f)
+        finally:
+            f.close()
+
+
+class _RecordingHandler:
+    """Event handler that records its calls before dispatching them."""
+
+    def __init__(self,recorder,handler,parentRef,key):
+        self.recorder = recorder
+        self.handler = handler
+        self.parentRef = parentRef
+        self.key = key
+
+    def __call__(self,*args,**kwds):
+        self.recorder.onEvent(self.key,self.parentRef())
+        return self.handler(*args,**kwds)
+
+
+# The recorder currently in use, if any
+_recorder = None
+
+def record(recorder=None):
+    """Start recording events for subsequently connected handlers.
+
+    A new EventRecorder is created unless an existing <recorder> is given.
+    The recorder in use is returned.
+    """
+    global _recorder
+    from XRCWidgets import connectors
+    stopRecording()
+    if recorder is None:
+        recorder = EventRecorder()
+    _recorder = recorder
+    connectors.addDispatchWrapper(recorder.wrap)
+    return recorder
+
+def stopRecording(path=None):
+    """Stop recording events for subsequently connected handlers.
+
+    Handlers that have already been connected continue to be recorded.
+    If <path> is given, the events recorded so far are saved to it.  The
+    recorder is returned, or None if there was none.
+    """
+    global _recorder
+    recorder = _recorder
+    if recorder is not None:
+        from XRCWidgets import connectors
+        connectors.removeDispatchWrapper(recorder.wrap)
+        _recorder = None
+        if path is not None:
+            recorder.save(path)
+    return recorder
+
+def getRecorder():
+    """Get the recorder currently in use, or None."""
+    return _recorder
+
+def loadEvents(path):
+    """Load the list of events saved by EventRecorder.save()."""
+    f = open(path,"r")
+    try:
+        data = json.load(f)
+    finally:
+        f.close()
+    if data.get("version") != EVENTS_VERSION:
+        raise XRCWidgetsError("Unsupported event recording '%s'" % (path,))
+    return data["events"]
+
+
+########
+##
+##  Replaying of events
+##
+########
+
+
+class ReplayEvent:
+    """Stand-in for the wx event that was originally dispatched.
+
+    It provides the methods most often used by event handlers.  Those
+    concerning the state of the event source reflect the replayed value;
+    those for the event's own processing, such as Skip(), are recorded
+    as attributes but otherwise have no effect.
+    """
+
+    def __init__(self,source,value=None):
+        self.source = source
+        self.value = value
+        self.skipped = False
+        self.enabled = None
+        self.checked = None
+
+    def Skip(self,skip=True):
+        self.skipped = skip
+
+    def GetEventObject(self):
+        return self.source
+
+    def GetId(self):
+        try:
+            return self.source.GetId()
+        except AttributeError:
+            return -1
+
+    def IsChecked(self):
+        return bool(self.value)
+
+    def GetInt(self):
+        try:
+            return int(self.value)
+        except (TypeError,ValueError):
+            return 0
+
+    def GetString(self):
+        if self.value is None:
+            return ""
+        return "%s" % (self.value,)
+
+    GetSelection = GetInt
+
+    def Enable(self,enable=True):
+        self.enabled = enable
+
+    def Check(self,check=True):
+        self.checked = check
+
+    def RequestMore(self,needMore=True):
+        pass
+
+
+class EventReplayer:
+    """Replays recorded events to the handlers of live widgets.
+
+    The replayer must be installed using connectors.addDispatchWrapper(),
+    or the install() function, before the widgets are created.  It keeps
+    the handlers connected while it is installed, so they stay alive until
+    clear() is called.
+
+    Statistics for each handler are kept in the attribute 'stats', a
+    dictionary mapping (class name,child name,action) tuples to HandlerStats
+    objects from XRCWidgets.monitor.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.stats = {}
+        self.elapsed = 0.0
+        self.missed = 0
+        self._instances = _Instances()
+
+    def wrap(self,handler,parent,cName,action):
+        """Remember <handler>, returning it unchanged.
+
+        This has the signature expected by connectors.addDispatchWrapper().
+        """
+        num = self._instances.number(parent)
+        key = (parent.__class__.__name__,num,cName,action)
+        self.handlers.setdefault(key,[]).append(handler)
+        return handler
+
+    def replay(self,events,setValues=True):
+        """Dispatch each of the given events to the matching handlers.
+
+        If <setValues> is true, recorded values are given to the children
+        before their handlers are called.  Pending wx events, such as those
+        posted by wx.CallAfter(), are processed after each event and count
+        towards the total time.  Events whose widget or handler cannot be
+        found are counted in the attribute 'missed'.  The total time taken
+        in seconds is returned.
+        """
+        app = _getApp()
+        start = timer()
+        for event in events:
+            key = (event["widget"],event["instance"],event["child"],
+                   event["action"])
+            widget = self._instances.find(key[0],key[1])
+            handlers = self.handlers.get(key)
+            if widget is None or not handlers:
+                self.missed += 1
+                continue
+            value = event.get("value")
+            if setValues and "value" in event:
+                widget.setValues({key[2]: value})
+            source = _getSource(widget,key[2])
+            statsKey = (key[0],key[2],key[3])
+            stats = self.stats.get(statsKey)
+            if stats is None:
+                stats = self.stats[statsKey] = HandlerStats()
+            for handler in handlers:
+                hStart = timer()
+                handler(ReplayEvent(source,value))
+                stats.record(timer() - hStart)
+            if app is not None:
+                app.ProcessPendingEvents()
+        elapsed = timer() - start
+        self.elapsed += elapsed
+        return elapsed
+
+    def report(self,stream=None):
+        """Write a summary of the replayed events to <stream>.
+
+        Handlers are listed in order of decreasing total time, followed by
+        the total time taken by the replay.  If <stream> is not given,
+        sys.stderr is used.
+        """
+        if stream is None:
+            stream = sys.stderr
+        order = sorted(self.stats.keys(),key=lambda k: -self.stats[k].total)
+        stream.write("%-50s %8s %10s %10s %10s\n" % ("handler","calls",
+                                                    "total ms","mean ms",
+                                                    "max ms"))
+        for key in order:
+            s = self.stats[key]
+            name = "%s.on_%s_%s" % key
+            stream.write("%-50s %8d %10.1f %10.2f %10.2f\n" % (name,
+                         s.count,s.total*1000,s.total*1000/s.count,
+                         s.max*1000))
+        stream.write("total %.1f ms, %d events missed\n" % (self.elapsed*1000,
+                                                           self.missed))
+
+    def clear(self):
+        """Forget all handlers and statistics."""
+        self.__init__()
+
+
+def _getApp():
+    """Get the running wx.App, if wxPython has been imported."""
+    wx = sys.modules.get("wx")
+    if wx is None:
+        return None
+    return wx.GetApp()
+
+def _getSource(widget,cName):
+    """Get the named child to use as an event's source, or None."""
+    try:
+        return widget.getChild(cName)
+    except XRCWidgetsError:
+        return None
+
+
+# The replayer currently installed, if any
+_replayer = None
+
+def install(replayer=None):
+    """Install a replayer to find subsequently connected handlers.
+
+    A new EventReplayer is created unless an existing <replayer> is given.
+    The replayer in use is returned.
+    """
+    global _replayer
+    from XRCWidgets import connectors
+    uninstall()
+    if replayer is None:
+        replayer = EventReplayer()
+    _replayer = replayer
+    connectors.addDispatchWrapper(replayer.wrap)
+    return replayer
+
+def uninstall():
+    """Stop finding subsequently connected handlers.
+
+    Handlers found so far can still be replayed to.
+    """
+    global _replayer
+    if _replayer is not None:
+        from XRCWidgets import connectors
+        connectors.removeDispatchWrapper(_replayer.wrap)
+        _replayer = None
+
+def getReplayer():
+    """Get the replayer currently installed, or None."""
+    return _replayer
+
@@ -0,0 +1,238 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.resources:  Locating and reading XRC data
+
+XRC data is identified by a 'location' string, which may be any of:
+
+    * a path on the filesystem
+    * a path that passes through a zip archive, for example the zipfile
+      of a zipapp that appears on sys.path: "/opt/app.pyz/pkg/mod.xrc"
+    * "package:<package>/<resource>", naming a resource within a python
+      package, which is read using the package's loader
+    * "memory:<key>", naming data that was registered with addData()
+
+The data at each location is read only once, and is decompressed if it was
+stored with gzip.  The same buffer is used for both the wx resource loader
+and our own XMLDocTree.  The exception is uncompressed files on the real
+filesystem, which are given to wx by name so that any relative paths they
+contain are resolved correctly.
+
+"""
+
+import os
+import sys
+import gzip
+import zipfile
+import pkgutil
+from io import BytesIO
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+try:
+    from importlib import resources as importlib_resources
+    importlib_resources.files
+except (ImportError,AttributeError):
+    importlib_resources = None
+
+from XRCWidgets import XRCWidgetsError
+from XRCWidgets import memory
+from XRCWidgets.utils import LRUCache
+
+
+MEMORY_PREFIX = "memory:"
+PACKAGE_PREFIX = "package:"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# XRC data that has been registered using addData(), keyed by location.
+# This cannot be re-read, so is kept separately from the cache below.
+_memoryData = {}
+
+# XRC data that has been read, keyed by location
+def _sizeOfData(location,data):
+    return len(data)
+_data = memory.registerCache("xrcdata",LRUCache(sizeof=_sizeOfData))
+
+# Names of the files in each zip archive that has been examined
+_archives = memory.registerCache("archives",
+                                 LRUCache(sizeof=memory.sizeOfValue))
+
+
+def addData(data,key=None):
+    """Register a string of XRC data, and return its location.
+
+    If <key> is not given, one is calculated from the data itself so that
+    registering the same data twice will produce the same location.  The
+    data may be compressed with gzip.
+    """
+    if key is None:
+        key = md5(data).hexdigest()
+    location = MEMORY_PREFIX + key
+    _memoryData[location] = _decompress(data)
+    return location
+
+
+def packageLocation(package,resource):
+    """Get the location of <resource> within the named python package."""
+    return "%s%s/%s" % (PACKAGE_PREFIX,package,resource)
+
+
+def exists(location):
+    """Check whether XRC data can be found at the given location."""
+    if location in _data:
+        return True
+    if location.startswith(MEMORY_PREFIX):
+        return location in _memoryData
+    if location.startswith(PACKAGE_PREFIX):
+        try:
+            getData(location)
+        except XRCWidgetsError:
+            return False
+        return True
+    if os.path.isfile(location):
+        return True
+    return _findInArchive(location) is not None
+
+
+def getData(location):
+    """Get the (uncompressed) XRC data from the given location."""
+    try:
+        return _data[location]
+    except KeyError:
+        pass
+    data = _decompress(_read(location))
+    _data[location] = data
+    return data
+
+
+def isPlainFile(location):
+    """Check whether the location is an uncompressed file on the filesystem.
+
+    Such files can be handed directly to wx, which can then resolve any
+    relative paths (e.g. to bitmaps) that they contain.
+    """
+    if location.startswith(MEMORY_PREFIX):
+        return False
+    if location.startswith(PACKAGE_PREFIX):
+        return False
+    if not os.path.isfile(location):
+        return False
+    f = open(location,"rb")
+    try:
+        return f.read(len(_GZIP_MAGIC)) != _GZIP_MAGIC
+    finally:
+        f.close()
+
+
+def getMTime(location):
+    """Get the modification time of the XRC data at the given location.
+
+    Data registered using addData() has a modification time of zero, while
+    data within an archive takes the modification time of the archive.
+    """
+    if location.startswith(MEMORY_PREFIX):
+        return 0
+    if location.startswith(PACKAGE_PREFIX):
+        (package,resource) = location[len(PACKAGE_PREFIX):].split("/",1)
+        try:
+            __import__(package)
+            pkgDir = os.path.dirname(sys.modules[package].__file__)
+            return os.path.getmtime(os.path.join(pkgDir,resource))
+        except (ImportError,OSError,AttributeError,TypeError):
+            return 0
+    if os.path.isfile(location):
+        return os.path.getmtime(location)
+    archived = _findInArchive(location)
+    if archived is None:
+        raise XRCWidgetsError("XRC File '%s' could not be found" % (location,))
+    return os.path.getmtime(archived[0])
+
+
+def _read(location):
+    """Read the raw data from the given location."""
+    if location.startswith(MEMORY_PREFIX):
+        try:
+            return _memoryData[location]
+        except KeyError:
+            eStr = "XRC data '%s' has not been added" % (location,)
+            raise XRCWidgetsError(eStr)
+    if location.startswith(PACKAGE_PREFIX):
+        return _readPackageData(location[len(PACKAGE_PREFIX):])
+    if os.path.isfile(location):
+        f = open(location,"rb")
+        try:
+            return f.read()
+        finally:
+            f.close()
+    archived = _findInArchive(location)
+    if archived is None:
+        raise XRCWidgetsError("XRC File '%s' could not be found" % (location,))
+    zf = zipfile.ZipFile(archived[0])
+    try:
+        return zf.read(archived[1])
+    finally:
+        zf.close()
+
+
+def _readPackageData(pkgPath):
+    """Read the data from a "<package>/<resource>" path."""
+    (package,resource) = pkgPath.split("/",1)
+    try:
+        if importlib_resources is not None:
+            pkgFiles = importlib_resources.files(package)
+            return pkgFiles.joinpath(resource).read_bytes()
+        data = pkgutil.get_data(package,resource)
+    except (ImportError,IOError,OSError,TypeError):
+        data = None
+    if data is None:
+        eStr = "XRC Resource '%s' could not be found" % (pkgPath,)
+        raise XRCWidgetsError(eStr)
+    return data
+
+
+def _findInArchive(path):
+    """Find a file stored within a zip archive on the filesystem.
+
+    If some leading portion of <path> names a zip archive, and the
+    remainder names a file within that archive, then the tuple
+    (<archive path>,<name within archive>) is returned.  Otherwise,
+    None is returned.
+    """
+    path = os.path.normpath(os.path.abspath(path))
+    (archive,member) = (path,"")
+    while True:
+        (archive,nm) = os.path.split(archive)
+        if not nm:
+            return None
+        if member:
+            member = nm + "/" + member
+        else:
+            member = nm
+        if os.path.isfile(archive):
+            break
+    try:
+        names = _archives[archive]
+    except KeyError:
+        names = set()
+        if zipfile.is_zipfile(archive):
+            zf = zipfile.ZipFile(archive)
+            try:
+                names = set(zf.namelist())
+            finally:
+                zf.close()
+        _archives[archive] = names
+    if member in names:
+        return (archive,member)
+    return None
+
+
+def _decompress(data):
+    """Decompress <data> if it was compressed using gzip."""
+    if data[:len(_GZIP_MAGIC)] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=BytesIO(data)).read()
+    return data
+
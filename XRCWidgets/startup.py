@@ -0,0 +1,156 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.startup:  Record and replay the work done at startup
+
+Most of the work of creating an XRCWidget is done lazily, the first time it
+is needed: finding the XRC file, loading the resource, building its index,
+finding the magic methods of the class and allocating the IDs of children.
+An application typically does the same work in the same order each time
+it starts.  This module can record which XRCWidget classes are created
+during the first few seconds of a session:
+
+    startup.record("myapp.profile",duration=30)
+
+The profile is saved when the time is up, or when the program exits.  On
+the next launch, the recorded work can be done ahead of time, once the
+wx.App has been created:
+
+    startup.preload("myapp.profile")
+
+The function autoProfile() does both: it preloads any existing profile,
+then records a fresh one.  Dialogs and frames that are opened at startup
+can also be built ahead of time using XRCWidgets.pool.
+
+"""
+
+import os
+import time
+import atexit
+import json
+
+from XRCWidgets import XRCWidgetsError
+from XRCWidgets.utils import importClass
+
+
+PROFILE_VERSION = 1
+
+
+class Recorder:
+    """Records the XRCWidget classes used during startup.
+
+    Recording stops once <duration> seconds have passed since the recorder
+    was created.  The profile lists the classes in the order they were
+    first used.
+    """
+
+    def __init__(self,duration=30):
+        self.duration = duration
+        self.started = time.time()
+        self._classes = []
+        self._entries = {}
+
+    def isExpired(self):
+        return time.time() - self.started > self.duration
+
+    def note(self,cls):
+        """Note that <cls> was used."""
+        key = "%s.%s" % (cls.__module__,cls.__name__)
+        if key not in self._entries:
+            entry = {"class": key}
+            self._entries[key] = entry
+            self._classes.append(entry)
+
+    def getProfile(self):
+        """Get the recorded profile, as a dictionary."""
+        return {"version": PROFILE_VERSION, "classes": self._classes}
+
+    def save(self,path):
+        f = open(path,"w")
+        try:
+            json.dump(self.getProfile(),f,indent=1)
+        finally:
+            f.close()
+
+
+# The active (Recorder,path) pair, if any.  XRCWidget checks this directly
+# so that it costs almost nothing when not recording.
+_recording = []
+
+def record(path,duration=30):
+    """Record a profile of startup to the file <path>.
+
+    Classes used in the next <duration> seconds are recorded.
+    The profile is saved when the time is up, when stop() is called, or
+    when the program exits.  Any recording already in progress is stopped.
+    """
+    stop()
+    _recording.append((Recorder(duration),path))
+
+def stop():
+    """Stop recording, saving the profile recorded so far."""
+    if _recording:
+        (recorder,path) = _recording.pop()
+        recorder.save(path)
+
+def isRecording():
+    return bool(_recording)
+
+def note(cls):
+    """Note the use of <cls> with the active recorder, if any."""
+    if _recording:
+        recorder = _recording[0][0]
+        if recorder.isExpired():
+            stop()
+        else:
+            recorder.note(cls)
+
+atexit.register(stop)
+
+
+def loadProfile(path):
+    """Load a profile saved by record(), returning it as a dictionary."""
+    f = open(path,"r")
+    try:
+        profile = json.load(f)
+    finally:
+        f.close()
+    if profile.get("version") != PROFILE_VERSION:
+        raise XRCWidgetsError("Unsupported startup profile '%s'" % (path,))
+    return profile
+
+def preload(profile):
+    """Do the work recorded in <profile> ahead of time.
+
+    <profile> may be a dictionary as returned by loadProfile(), or the path
+    of a file to load it from.  The preload() method of each recorded class
+    is called in the order they were first used.  Classes that can no
+    longer be imported or loaded are skipped, so a stale profile does no
+    harm.  The number of classes preloaded is returned.
+    """
+    if not isinstance(profile,dict):
+        profile = loadProfile(profile)
+    count = 0
+    for entry in profile["classes"]:
+        try:
+            cls = importClass(entry["class"])
+            cls.preload()
+        except (ImportError,AttributeError,XRCWidgetsError):
+            continue
+        count += 1
+    return count
+
+def autoProfile(path,duration=30):
+    """Preload the profile at <path> if it exists, then record it afresh.
+
+    This should be called as soon as the wx.App has been created.
+    """
+    if os.path.exists(path):
+        try:
+            preload(path)
+        except (XRCWidgetsError,ValueError,KeyError):
+            pass
+    record(path,duration)
+
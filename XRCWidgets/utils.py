@@ -51,6 +51,202 @@ class rcurry(_curry):
         return self.func(*callArgs,**callKwds)
 
 
+##
+##  Weakly-referencing curries via 'wcurry'
+##
+
+import weakref
+import types
+
+class _StrongRef:
+    """Stand-in for a weakref to objects that can't be weakly referenced."""
+
+    def __init__(self,obj):
+        self.obj = obj
+
+    def __call__(self):
+        return self.obj
+
+
+class _WeakMethodRef:
+    """Weak reference to a bound method.
+
+    Bound methods are created on the fly, so a weakref to one would die
+    immediately.  This instead weakly references the object that the method
+    is bound to, and rebinds the function to it when called.
+    """
+
+    def __init__(self,method):
+        self.obj = weakref.ref(method.__self__)
+        self.func = method.__func__
+
+    def __call__(self):
+        obj = self.obj()
+        if obj is None:
+            return None
+        return types.MethodType(self.func,obj)
+
+
+def _isBoundMethod(obj):
+    return getattr(obj,"__self__",None) is not None and hasattr(obj,"__func__")
+
+def makeRef(obj):
+    """Make a weak reference to <obj>, if possible."""
+    if _isBoundMethod(obj):
+        return _WeakMethodRef(obj)
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return _StrongRef(obj)
+
+
+class wcurry(_curry):
+    """Weak left-curry class.
+    This curry behaves like lcurry, but holds only weak references to its
+    positional arguments.  If the function is a bound method, the object it
+    is bound to is also weakly referenced; other functions are held normally
+    so that lambdas and the like don't die immediately.  Arguments that
+    cannot be weakly referenced (such as numbers or strings) are also held
+    normally.
+
+    Once any of the weakly referenced objects has died the curry is said to
+    be dead.  Calling a dead curry does nothing and returns None.
+    """
+
+    def __init__(self,func,*args,**kwds):
+        if _isBoundMethod(func):
+            self.func = _WeakMethodRef(func)
+        else:
+            self.func = _StrongRef(func)
+        self.args = tuple([makeRef(a) for a in args])
+        self.kwds = kwds.copy()
+
+    def _deref(self):
+        """Get the function and arguments, or None if the curry is dead."""
+        func = self.func()
+        if func is None:
+            return None
+        args = []
+        for ref in self.args:
+            a = ref()
+            if a is None and not isinstance(ref,_StrongRef):
+                return None
+            args.append(a)
+        return (func,tuple(args))
+
+    def alive(self):
+        """Check whether all referenced objects are still alive."""
+        return self._deref() is not None
+
+    def __call__(self,*args,**kwds):
+        refs = self._deref()
+        if refs is None:
+            return None
+        callKwds = self.kwds.copy()
+        callKwds.update(kwds)
+        return refs[0](*(refs[1] + args),**callKwds)
+
+
+##
+##  Size-limited caching with least-recently-used eviction
+##
+
+from collections import OrderedDict
+
+class LRUCache(object):
+    """Dictionary-like cache that evicts its least-recently-used entries.
+
+    The cache may be limited in the number of entries it holds, in the
+    total size of those entries, or both.  A limit of None means that no
+    limit is applied.  The size of each entry is found by calling <sizeof>
+    with its key and value; if <sizeof> is not given, all entries have
+    zero size.
+
+    The attributes 'hits', 'misses' and 'evictions' count the corresponding
+    events over the lifetime of the cache, and 'bytes' gives the total
+    size of the entries it currently holds.
+    """
+
+    def __init__(self,maxEntries=None,maxBytes=None,sizeof=None):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self,key):
+        return key in self._entries
+
+    def __getitem__(self,key):
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self._entries[key] = value
+        self.hits += 1
+        return value
+
+    def get(self,key,default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self,key,value):
+        if key in self._entries:
+            del self[key]
+        if self.sizeof is None:
+            size = 0
+        else:
+            size = self.sizeof(key,value)
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.bytes += size
+        self._evict()
+
+    def __delitem__(self,key):
+        del self._entries[key]
+        self.bytes -= self._sizes.pop(key)
+
+    def keys(self):
+        """List the keys in the cache, least-recently-used first."""
+        return list(self._entries.keys())
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+    def setLimits(self,maxEntries=None,maxBytes=None):
+        """Change the limits on the cache, evicting entries if necessary."""
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self._evict()
+
+    def _overLimit(self):
+        """Check whether the cache currently exceeds its limits."""
+        if self.maxEntries is not None:
+            if len(self._entries) > self.maxEntries:
+                return True
+        if self.maxBytes is not None and self.bytes > self.maxBytes:
+            return True
+        return False
+
+    def _evict(self):
+        """Evict least-recently-used entries until within the limits."""
+        while self._entries and self._overLimit():
+            del self[next(iter(self._entries))]
+            self.evictions += 1
+
+
 ##
 ##  Basic XML parsing for our own reading of the XRC file
 ##
@@ -90,60 +286,199 @@ class XMLDocTree:
     element, and the dictionary 'elements' which maps values of the XML
     attribute "name" to the XMLElementData object for the corresponding
     element.
+
+    The document may be parsed using any of the backends listed by
+    getXMLBackends(), and the resulting tree is the same whichever is used.
+    Each run of text between elements becomes a single string child, with
+    every line stripped of surrounding whitespace and the non-empty lines
+    joined by single spaces.  Namespaces are ignored.
     """
 
-    def __init__(self,xmlfile):
+    def __init__(self,xmlfile,backend=None):
         """XMLDocTree initialiser.
-        A file-like object containing the XML data must be given.
+        A file-like object containing the XML data must be given.  The
+        parsing backend may be named by <backend>, otherwise the default
+        set by setDefaultXMLBackend() is used.
         """
-
         self.root = None
-        self._curElem = None
         self.elements = {}
+        if backend is None:
+            backend = _defaultBackend[0]
+        try:
+            parse = _backends[backend]
+        except KeyError:
+            raise XMLBackendError("Unknown XML backend: '%s'" % (backend,))
+        parse(_TreeBuilder(self),xmlfile)
+
+
+class _TreeBuilder:
+    """Builds an XMLDocTree from a stream of parser events.
 
-        parser = expat.ParserCreate()
-        parser.StartElementHandler = self.onStart
-        parser.EndElementHandler = self.onEnd
-        parser.CharacterDataHandler = self.onCdata
-        parser.ParseFile(xmlfile)
+    Text passed to data() is buffered until the next element starts or
+    ends, so that it is only normalised and stored once per run.
+    """
 
+    def __init__(self,tree):
+        self.tree = tree
+        self._curElem = None
+        self._text = []
 
-    def onStart(self,name,attrs):
+    def start(self,name,attrs):
+        self._flushText()
         data = XMLElementData()
-        data.name = name
-        data.attrs = attrs
+        data.name = _localName(name)
+        for (key,value) in attrs.items():
+            if key == "xmlns" or key.startswith("xmlns:"):
+                continue
+            data.attrs[_localName(key)] = value
         data.parent = self._curElem
         if self._curElem is not None:
             self._curElem.children.append(data)
         self._curElem = data
         try:
-            nm = attrs["name"]
-            if self.elements.has_key(nm):
-                raise XMLNameError("Duplicate element name: '%s'" % (nm,))
-            self.elements[nm] = data
+            nm = data.attrs["name"]
         except KeyError:
             pass
+        else:
+            if nm in self.tree.elements:
+                raise XMLNameError("Duplicate element name: '%s'" % (nm,))
+            self.tree.elements[nm] = data
 
-
-    def onEnd(self,name):
+    def end(self,name=None):
+        self._flushText()
         if self._curElem.parent is not None:
             self._curElem = self._curElem.parent
         else:
-            self.root = self._curElem
+            self.tree.root = self._curElem
             self._curElem = None
 
-    def onCdata(self,cdata):
-        cdata = cdata.strip()
-        if cdata != "":
-            # Append CData to previous child if it was also CData
-            if len(self._curElem.children) == 0:
-                self._curElem.children.append(cdata)
-            else:
-                prevChild = self._curElem.children[-1]
-                if not isinstance(prevChild,XMLElementData):
-                    self._curElem.children[-1] = "%s %s" % (prevChild,cdata)
-                else:
-                    self._curElem.children.append(cdata)
+    def data(self,text):
+        self._text.append(text)
+
+    def _flushText(self):
+        if self._text:
+            text = _normaliseText(u"".join(self._text))
+            self._text = []
+            if text and self._curElem is not None:
+                self._curElem.children.append(text)
+
+
+def _normaliseText(text):
+    """Strip each line of <text>, and join the non-empty lines by spaces."""
+    lines = [ln.strip() for ln in text.splitlines()]
+    return u" ".join([ln for ln in lines if ln])
+
+def _localName(name):
+    """Remove any namespace from an element or attribute name."""
+    if name.startswith("{"):
+        return name.split("}",1)[1]
+    if ":" in name:
+        return name.split(":",1)[1]
+    return name
+
+
+##  Parsing backends.  Each is a function taking a _TreeBuilder and a
+##  file-like object, which feeds the builder with the parsed document.
+
+def _parseExpat(builder,xmlfile):
+    """Parse using expat, with text buffered by the parser."""
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.buffer_size = 65536
+    parser.StartElementHandler = builder.start
+    parser.EndElementHandler = builder.end
+    parser.CharacterDataHandler = builder.data
+    parser.ParseFile(xmlfile)
+
+def _parseETree(builder,xmlfile):
+    """Parse using xml.etree's iterparse, then convert the tree."""
+    try:
+        from xml.etree import cElementTree as ElementTree
+    except ImportError:
+        from xml.etree import ElementTree
+    root = None
+    for (event,elem) in ElementTree.iterparse(xmlfile,events=("start",)):
+        if root is None:
+            root = elem
+    _replayTree(builder,root)
+
+def _parseLXML(builder,xmlfile):
+    """Parse using lxml, then convert the tree."""
+    try:
+        from lxml import etree
+    except ImportError:
+        raise XMLBackendError("The lxml backend requires lxml")
+    _replayTree(builder,etree.parse(xmlfile).getroot())
+
+def _replayTree(builder,root):
+    """Feed the contents of an ElementTree-style tree to <builder>.
+
+    Comments and processing instructions are skipped, but the text that
+    follows them is kept.  The tree is traversed without recursion.
+    """
+    stack = [("start",root)]
+    while stack:
+        (op,item) = stack.pop()
+        if op == "text":
+            builder.data(item)
+        elif op == "end":
+            builder.end()
+        elif isinstance(item.tag,_stringTypes):
+            builder.start(item.tag,item.attrib)
+            if item.text:
+                builder.data(item.text)
+            stack.append(("end",None))
+            chldrn = list(item)
+            chldrn.reverse()
+            for child in chldrn:
+                if child.tail:
+                    stack.append(("text",child.tail))
+                stack.append(("start",child))
+
+try:
+    _stringTypes = (str,unicode)
+except NameError:
+    _stringTypes = (str,)
+
+
+class XMLBackendError(Exception): pass
+
+_backends = {
+    "expat": _parseExpat,
+    "etree": _parseETree,
+    "lxml": _parseLXML,
+}
+
+# The default backend, held in a list so it can be changed in place
+_defaultBackend = ["expat"]
+
+def getXMLBackends():
+    """Get the names of the XMLDocTree backends that can be used."""
+    names = ["expat","etree"]
+    try:
+        import lxml.etree
+    except ImportError:
+        pass
+    else:
+        names.append("lxml")
+    return names
+
+def setDefaultXMLBackend(name):
+    """Set the backend used by XMLDocTree when none is specified."""
+    if name not in _backends:
+        raise XMLBackendError("Unknown XML backend: '%s'" % (name,))
+    _defaultBackend[0] = name
+
+
+##
+##  Importing classes by name, as recorded in profiles and generated code
+##
 
+import sys
 
+def importClass(name):
+    """Import the class named by the dotted path <name>."""
+    (modName,clsName) = name.rsplit(".",1)
+    __import__(modName)
+    return getattr(sys.modules[modName],clsName)
 
@@ -0,0 +1,255 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.validation:  Declarative validation of child values
+
+An XRCWidget subclass may validate the values of its children by listing
+validators in the class-level attribute _validators, which maps the names
+of children to a validator or a list of validators:
+
+    class SignupPanel(XRCPanel):
+        _validators = {
+            "username": [Required(), Length(maximum=16)],
+            "age":      Range(18,150),
+            "confirm":  Check(lambda v,vals: v == vals["password"],
+                              "Passwords do not match",
+                              depends=("password",)),
+        }
+
+Whenever one of these children (or a child that a validator depends on) is
+changed by the user, only the validators affected by that child are run.
+Each validator is given only the values it needs, so the cost of handling
+a change does not grow with the size of the form.  Children whose validity
+changes are then decorated in a single pass; see XRCWidget.validate() and
+XRCWidget.decorateError().  Validated children, and those they depend on,
+must support the "change" action; XRCWidgetsError is raised when the widget
+is created if one does not, as for a wxGauge.
+
+This module does not need wxPython.
+
+"""
+
+import re
+
+from XRCWidgets import XRCWidgetsError
+
+try:
+    _stringTypes = (str,unicode)
+except NameError:
+    _stringTypes = (str,)
+
+def _toText(value):
+    """Convert a child's value to a string, for validators of text."""
+    if value is None:
+        return ""
+    if not isinstance(value,_stringTypes):
+        return "%s" % (value,)
+    return value
+
+
+class Validator:
+    """Base class for validators of the value of a single child.
+
+    Subclasses should override check(), which is given the value of the
+    child and a dictionary of the values of the child and of each child
+    named in <depends>.  It must return true if the value is valid.  If it
+    is not, <message> is reported as the error.
+    """
+
+    message = "Invalid value"
+
+    def __init__(self,message=None,depends=()):
+        if message is not None:
+            self.message = message
+        self.depends = tuple(depends)
+
+    def check(self,value,values):
+        return True
+
+    def __call__(self,cName,values):
+        """Validate child <cName>, returning an error message or None."""
+        if self.check(values[cName],values):
+            return None
+        return self.message
+
+
+class Check(Validator):
+    """Validator calling <func>(<value>,<values>) to check the value."""
+
+    def __init__(self,func,message=None,depends=()):
+        Validator.__init__(self,message,depends)
+        self.func = func
+
+    def check(self,value,values):
+        return self.func(value,values)
+
+
+class Required(Validator):
+    """Validator requiring a value to be given, or a checkbox to be set."""
+
+    message = "A value is required"
+
+    def check(self,value,values):
+        return value is not None and value != "" and value is not False
+
+
+class Range(Validator):
+    """Validator requiring a number between <minimum> and <maximum>.
+
+    Either limit may be None.  Strings are converted to numbers, and are
+    invalid if they cannot be converted.  Empty values are allowed; use
+    Required() as well to reject them.
+    """
+
+    def __init__(self,minimum=None,maximum=None,message=None,depends=()):
+        if message is None:
+            if minimum is None:
+                message = "Must be at most %s" % (maximum,)
+            elif maximum is None:
+                message = "Must be at least %s" % (minimum,)
+            else:
+                message = "Must be between %s and %s" % (minimum,maximum)
+        Validator.__init__(self,message,depends)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def check(self,value,values):
+        if value is None or value == "":
+            return True
+        try:
+            value = float(value)
+        except (TypeError,ValueError):
+            return False
+        if self.minimum is not None and value < self.minimum:
+            return False
+        if self.maximum is not None and value > self.maximum:
+            return False
+        return True
+
+
+class Length(Validator):
+    """Validator requiring between <minimum> and <maximum> characters.
+
+    Values that are not strings, such as those of spin controls, are
+    converted to strings before they are measured.
+    """
+
+    def __init__(self,minimum=0,maximum=None,message=None,depends=()):
+        if message is None:
+            if maximum is None:
+                message = "Must be at least %d characters" % (minimum,)
+            else:
+                message = "Must be at most %d characters" % (maximum,)
+        Validator.__init__(self,message,depends)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def check(self,value,values):
+        value = _toText(value)
+        if len(value) < self.minimum:
+            return False
+        if self.maximum is not None and len(value) > self.maximum:
+            return False
+        return True
+
+
+class Pattern(Validator):
+    """Validator requiring the whole value to match a regular expression.
+
+    Empty values are allowed; use Required() as well to reject them.  As
+    for Length, values that are not strings are converted to strings.
+    """
+
+    message = "Invalid format"
+
+    def __init__(self,pattern,message=None,depends=()):
+        Validator.__init__(self,message,depends)
+        self.regex = re.compile(pattern)
+
+    def check(self,value,values):
+        value = _toText(value)
+        if not value:
+            return True
+        match = self.regex.match(value)
+        return match is not None and match.end() == len(value)
+
+
+class ValidationPlan:
+    """The validators of an XRCWidget class, compiled for quick lookup.
+
+    This is built once for each class from its _validators attribute.  It
+    has the following attributes:
+
+        * checks:   maps each validated child to its list of validators
+        * inputs:   maps each validated child to the names of the children
+                    whose values its validators need
+        * affected: maps the name of each child that can affect validity to
+                    the validated children that must be checked again when
+                    it changes
+
+    """
+
+    def __init__(self,validators):
+        self.checks = {}
+        self.inputs = {}
+        self.affected = {}
+        for target in sorted(validators.keys()):
+            checks = validators[target]
+            if isinstance(checks,Validator):
+                checks = [checks]
+            checks = list(checks)
+            for check in checks:
+                if not callable(check):
+                    eStr = "Validator for child '%s' is not callable"
+                    raise XRCWidgetsError(eStr % (target,))
+            inputs = [target]
+            for check in checks:
+                for dep in getattr(check,"depends",()):
+                    if dep not in inputs:
+                        inputs.append(dep)
+            self.checks[target] = checks
+            self.inputs[target] = tuple(inputs)
+            for cName in inputs:
+                self.affected.setdefault(cName,[]).append(target)
+
+    def getTargets(self,cNames=None):
+        """Get the validated children affected by the named children.
+
+        If <cNames> is None, all validated children are returned.
+        """
+        if cNames is None:
+            return sorted(self.checks.keys())
+        targets = []
+        for cName in cNames:
+            for target in self.affected.get(cName,()):
+                if target not in targets:
+                    targets.append(target)
+        return targets
+
+    def run(self,targets,getValue):
+        """Run the validators for the given children.
+
+        <getValue> is called with the name of a child to get its value; it
+        is called at most once for each child.  A dictionary is returned
+        mapping each target to its first error message, or None if it is
+        valid.
+        """
+        cache = {}
+        results = {}
+        for target in targets:
+            values = {}
+            for cName in self.inputs[target]:
+                try:
+                    values[cName] = cache[cName]
+                except KeyError:
+                    values[cName] = cache[cName] = getValue(cName)
+            error = None
+            for check in self.checks[target]:
+                error = check(target,values)
+                if error is not None:
+                    break
+            results[target] = error
+        return results
+
@@ -0,0 +1,196 @@
+# Copyright 2004-2009, Ryan Kelly
+# Released under the terms of the MIT Licence.
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.virtual:  Virtual scrolling of many rows of XRCPanels
+
+A list of thousands of rows, each an XRCPanel, uses a lot of memory and is
+slow to lay out if every row is a real window.  This module provides the
+XRCRowList class, a scrolled window that shows the rows of a data source
+using only as many panels as fit in the visible area, plus a few rows of
+'overscan' above and below.  As the list is scrolled, panels whose rows are
+no longer needed are recycled to display the newly visible rows:
+
+    rows = XRCRowList(parent,RowPanel,source)
+
+The data source may be any sequence; its length gives the number of rows,
+and each item gives the data to display in the corresponding row.  By
+default this is a dictionary passed to the panel's setValues() method.
+
+"""
+
+import wx
+
+
+class XRCRowList(wx.ScrolledWindow):
+    """Scrolled window showing a row panel for each item of a data source.
+
+    <rowClass> must be an XRCPanel subclass, instances of which are created
+    as required with <rowClass>(<list>).  All rows are given the same height,
+    which is taken from the best size of the first panel unless <rowHeight>
+    is given.  <overscan> rows either side of the visible area are also
+    kept bound, so that small scrolls do not need to rebind any panels.
+
+    A panel is bound to the data for a row using bindRow(), which calls
+    <bind>(<panel>,<index>,<data>) if it was given, and otherwise passes the
+    data to the panel's setValues() method.  Subclasses may instead override
+    bindRow() itself.
+    """
+
+    def __init__(self,parent,rowClass,source=(),overscan=2,rowHeight=None,
+                 bind=None,id=-1,pos=wx.DefaultPosition,size=wx.DefaultSize,
+                 style=wx.VSCROLL):
+        wx.ScrolledWindow.__init__(self,parent,id,pos,size,style)
+        self._rowClass = rowClass
+        self._source = source
+        self._overscan = overscan
+        self._rowHeight = rowHeight
+        self._bind = bind
+        self._rows = {}
+        self._pool = []
+        self._syncPending = False
+        self.Bind(wx.EVT_SCROLLWIN,self._onViewChange)
+        self.Bind(wx.EVT_MOUSEWHEEL,self._onViewChange)
+        self.Bind(wx.EVT_SIZE,self._onViewChange)
+        self._scheduleSync()
+
+    def SetSource(self,source):
+        """Display the rows of a new data source.
+
+        All bound panels are rebound to the new data, and the list is
+        scrolled back to the top.
+        """
+        self._source = source
+        self._releaseRows(list(self._rows.keys()))
+        self.Scroll(0,0)
+        self._syncRows()
+
+    def GetSource(self):
+        return self._source
+
+    def GetRowCount(self):
+        return len(self._source)
+
+    def GetRowPanel(self,index):
+        """Get the panel currently bound to the given row, or None."""
+        return self._rows.get(index)
+
+    def GetVisibleRange(self):
+        """Get the range of rows that are at least partly visible.
+
+        The tuple (<first>,<stop>) is returned, where <stop> is one more
+        than the last visible row.
+        """
+        rowH = self._getRowHeight()
+        top = self.CalcUnscrolledPosition(0,0)[1]
+        height = self.GetClientSize()[1]
+        first = top // rowH
+        stop = (top + height + rowH - 1) // rowH
+        return (first,min(stop,len(self._source)))
+
+    def ScrollToRow(self,index):
+        """Scroll the list so that the given row is at the top."""
+        self.Scroll(-1,index)
+        self._syncRows()
+
+    def RefreshRows(self,indices=None):
+        """Rebind the panels for the given rows to their current data.
+
+        This should be called after rows of the data source are changed in
+        place.  If <indices> is not given, all bound rows are rebound.  Rows
+        that are not currently bound are ignored, as they will be bound to
+        the new data when they are scrolled into view.
+        """
+        if indices is None:
+            indices = list(self._rows.keys())
+        self.Freeze()
+        try:
+            for idx in indices:
+                panel = self._rows.get(idx)
+                if panel is not None:
+                    self.bindRow(panel,idx,self._source[idx])
+        finally:
+            self.Thaw()
+
+    def bindRow(self,panel,index,data):
+        """Display the data for row <index> in the given panel."""
+        if self._bind is not None:
+            self._bind(panel,index,data)
+        else:
+            panel.setValues(data)
+
+    ##  Internal methods for managing the pool of panels
+
+    def _getRowHeight(self):
+        """Get the height of each row, creating the first panel if needed."""
+        if self._rowHeight is None:
+            panel = self._createPanels(1)[0]
+            self._pool.append(panel)
+            self._rowHeight = max(panel.GetBestSize()[1],1)
+        return self._rowHeight
+
+    def _createPanels(self,count):
+        panels = self._rowClass.createMany(self,count)
+        for panel in panels:
+            panel.Hide()
+        return panels
+
+    def _releaseRows(self,indices):
+        """Return the panels for the given rows to the pool."""
+        for idx in indices:
+            self._pool.append(self._rows.pop(idx))
+
+    def _onViewChange(self,evt):
+        evt.Skip()
+        self._scheduleSync()
+
+    def _scheduleSync(self):
+        """Synchronise the rows once the current event has been handled.
+
+        Scrolling is done by wx after our event handlers have run, so the
+        new view is only known once the event loop regains control.
+        """
+        if not self._syncPending:
+            self._syncPending = True
+            wx.CallAfter(self._syncRows)
+
+    def _syncRows(self):
+        """Bind and position panels for all rows in or near the view."""
+        self._syncPending = False
+        if not self:
+            return
+        numRows = len(self._source)
+        if numRows == 0:
+            self._releaseRows(list(self._rows.keys()))
+            for panel in self._pool:
+                panel.Hide()
+            self.SetVirtualSize((-1,0))
+            return
+        rowH = self._getRowHeight()
+        width = self.GetClientSize()[0]
+        self.SetScrollRate(0,rowH)
+        self.SetVirtualSize((width,numRows*rowH))
+        (first,stop) = self.GetVisibleRange()
+        first = max(first - self._overscan,0)
+        stop = min(stop + self._overscan,numRows)
+        unwanted = [idx for idx in self._rows if idx < first or idx >= stop]
+        self._releaseRows(unwanted)
+        missing = [idx for idx in range(first,stop) if idx not in self._rows]
+        if len(missing) > len(self._pool):
+            self._pool.extend(self._createPanels(len(missing)-len(self._pool)))
+        self.Freeze()
+        try:
+            for idx in missing:
+                panel = self._pool.pop()
+                self._rows[idx] = panel
+                self.bindRow(panel,idx,self._source[idx])
+            for (idx,panel) in self._rows.items():
+                (x,y) = self.CalcScrolledPosition(0,idx*rowH)
+                panel.SetDimensions(x,y,width,rowH)
+                panel.Show()
+            for panel in self._pool:
+                panel.Hide()
+        finally:
+            self.Thaw()
+
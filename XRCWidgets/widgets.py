@@ -0,0 +1,1629 @@
+# Copyright 2004, Ryan Kelly
+# Released under the terms of the MIT license
+# See the file 'LICENSE.txt' in the main distribution for details.
+"""
+
+    XRCWidgets.widgets:  The XRCWidget class and its wxPython subclasses
+
+This module contains everything in XRCWidgets that needs wxPython.  It is
+imported automatically the first time one of its classes is accessed from
+the main XRCWidgets package, so it should rarely need to be imported directly.
+
+"""
+
+import sys
+import os
+import time
+import threading
+from io import BytesIO
+from collections import OrderedDict
+
+import wx
+from wx import xrc
+
+from XRCWidgets import XRCWidgetsError, NotGiven
+from XRCWidgets import resources
+from XRCWidgets import memory
+from XRCWidgets import codegen
+from XRCWidgets import bitmaps
+from XRCWidgets import pool
+from XRCWidgets import startup
+from XRCWidgets.validation import ValidationPlan
+from XRCWidgets.utils import lcurry, XMLDocTree, XMLElementData, LRUCache
+from XRCWidgets.connectors import getConnectors
+from XRCWidgets.index import getIndex
+
+
+########
+##
+##  Base XRCWidget Class
+##
+########
+
+
+class XRCWidget(object):
+    """Mix-in class providing basic XRC behaviors.
+
+    Classes inheriting from this class should also inherit from one of the
+    wxPython GUI classes that can be loaded from an XRC file - for example,
+    wxPanel or wxFrame.  This class provides the mechanisms for automatically
+    locating the XRC file and loading the definitions from it.
+    """
+
+    # Name of the XRC file to load content from
+    # Will be searched for along the default XRC file path
+    # Set at class-level in the subclass to force a specific name
+    _xrcfilename = None
+
+    # Location of the XRC file to load content from
+    # Can be set at class-level in the subclass to force a specific location
+    # This may be any location understood by XRCWidgets.resources
+    _xrcfile = None
+
+    # XRC data to load content from, as a (possibly gzipped) string
+    # Set at class-level in the subclass to avoid searching for a file
+    _xrcdata = None
+
+    # Name of the resource to load from the XRC file, containing definitions
+    # for this object.  Defaults to the name of the class.
+    # Set at class-level to specify a specific name.
+    _xrcname = None
+
+    # Whether not not to look for any connect methods with magic names of
+    # the form on_<name>_<action>.  Set to false to make initialisation
+    # quicker.
+    _useMagicMethods = True
+
+    # Whether to connect magic methods using only weak references to the
+    # widget and its children.  Set to true to ensure that connected event
+    # handlers do not keep the widget alive after it has been destroyed.
+    _useWeakHandlers = False
+
+    # Controls for the queue of updates made by queueUpdate().  Queued
+    # updates are applied in a batch after <_updateInterval> milliseconds,
+    # or when the event loop is next idle if it is zero.  Each batch may
+    # take at most <_updateBudget> seconds, with any remaining updates
+    # being deferred to the next batch.
+    _updateInterval = 0
+    _updateBudget = 0.02
+
+    # Whether to batch the on_create() calls of widgets created by the XRC
+    # loader (i.e. named in a 'subclass' attribute).  If true, these calls
+    # are collected and run together in a single pass, followed by a single
+    # layout of each affected top-level window.
+    _batchOnCreate = False
+
+    # Parts of the resource to be loaded on demand.  This maps the names of
+    # placeholder children to the names of other resources from the same
+    # XRC file, which must be panels.  Each resource is loaded into its
+    # placeholder the first time the placeholder is shown, or when it or
+    # any child of the resource is accessed using getChild().
+    _deferredContent = {}
+
+    # Whether to create the widget using code generated from the XRC file
+    # by XRCWidgets.codegen, if it exists and is newer than the XRC file.
+    # Set to false to always load from the XRC file itself.
+    _useGeneratedCode = True
+
+    # Validators for the values of children, as described in the module
+    # XRCWidgets.validation.  This maps the names of children to a validator
+    # or list of validators, which are run when the children they depend
+    # on are changed by the user.  By default, invalid children are given
+    # <_errorColour> as their background colour; see decorateError().
+    _validators = {}
+    _errorColour = "pink"
+
+    # The XRCWidgets.pool.WidgetPool that this widget was created by, if any.
+    # Pooled widgets are returned to their pool rather than destroyed, and
+    # count the number of times they have been returned.
+    _widgetPool = None
+    _poolReleases = 0
+
+    # When this event is fired, we know the widget is fully initialized.
+    _initEvent = wx.EVT_WINDOW_CREATE
+
+    # Methods used to get and set the value of each type of child widget,
+    # as used by getValues() and setValues().  Children whose type is not
+    # listed here are not considered to have a value.
+    _valueAccessors = {
+        "wxTextCtrl":     ("GetValue","SetValue"),
+        "wxComboBox":     ("GetValue","SetValue"),
+        "wxCheckBox":     ("GetValue","SetValue"),
+        "wxRadioButton":  ("GetValue","SetValue"),
+        "wxToggleButton": ("GetValue","SetValue"),
+        "wxSlider":       ("GetValue","SetValue"),
+        "wxSpinCtrl":     ("GetValue","SetValue"),
+        "wxSpinButton":   ("GetValue","SetValue"),
+        "wxGauge":        ("GetValue","SetValue"),
+        "wxChoice":       ("GetStringSelection","SetStringSelection"),
+        "wxListBox":      ("GetStringSelection","SetStringSelection"),
+        "wxRadioBox":     ("GetSelection","SetSelection"),
+    }
+
+    def __init__(self,parent=NotGiven):
+        self._xmltree = None
+        self._xrcindex = None
+        self._valueChildren = None
+        self._handlerCount = 0
+        self._handlerBytes = 0
+        self._deferredNames = {}
+        self._deferredLoaded = {}
+        self._eventsConnected = False
+        self._pendingUpdates = OrderedDict()
+        self._updateLock = threading.Lock()
+        self._updateScheduled = False
+        self._validationErrors = {}
+        self._validationNames = None
+        self._savedTooltips = {}
+        memory.trackInstance(self)
+        if startup._recording:
+            startup.note(self.__class__)
+        if self._xrcfile is None:
+            self._xrcfile = _getXRCFileLocation(self.__class__)
+        pre = self._getPre()
+        if parent is NotGiven:
+            #  Assume the caller is doing two-phase creation themselves.
+            self.PostCreate(pre)
+            self._bindPooledClose()
+            self.Bind(self._initEvent,self._handle_on_create)
+        else:
+            #  Delegate the two-phase create to the XRC loader
+            self._loadXRCFile(self._xrcfile,pre,parent)
+
+    @classmethod
+    def createMany(cls,parent,count,*args):
+        """Create <count> instances of this class as children of <parent>.
+
+        This is equivalent to calling cls(parent,*args) <count> times, but
+        the parent is frozen until all instances have been created.  If the
+        parent has a sizer, the instances are added to it and laid out once
+        at the end.  A list of the new instances is returned.
+
+        All the instances share the XRC file location, loaded resource,
+        index (including the table of child IDs) and list of magic methods,
+        so these are only calculated for the first one.
+        """
+        widgets = []
+        sizer = parent.GetSizer()
+        parent.Freeze()
+        try:
+            for i in range(count):
+                widget = cls(parent,*args)
+                if sizer is not None:
+                    sizer.Add(widget,0,wx.EXPAND)
+                widgets.append(widget)
+        finally:
+            parent.Thaw()
+        if sizer is not None:
+            parent.Layout()
+        return widgets
+
+    def _handle_on_create(self,event=None):
+        self.Unbind(self._initEvent)
+        if self._batchOnCreate:
+            _pendingCreates.append(self)
+            if len(_pendingCreates) == 1:
+                wx.CallAfter(_runPendingCreates)
+        else:
+            wx.CallAfter(self.on_create)
+
+    def on_create(self):
+        shown = ()
+        if self._deferredContent:
+            shown = self._setupDeferredContent()
+        if self._useMagicMethods or self._validators:
+            self._connectEventMethods()
+        self._eventsConnected = True
+        for phName in shown:
+            self.loadDeferred(phName)
+
+    def compact(self):
+        """Reduce memory/resource usage of the widget.
+
+        This method is called automatically after initialisation to drop
+        references to unneeded resources.  These may be accumulated as
+        as time goes on, so this method may be called manually to release
+        them if they are causing a problem.
+        """
+        self._xmltree = None
+
+    def _getOwnedData(self):
+        """Get the data owned by this widget, for memory accounting.
+
+        The data is returned as a dictionary mapping category names to
+        the objects in that category.  Subclasses that keep additional
+        data should extend this dictionary.
+        """
+        return {"xmltree": self._xmltree,
+                "values": self._valueChildren,
+                "updates": self._pendingUpdates,
+                "deferred": self._deferredNames,
+                "validation": self._validationErrors}
+
+    def _getOwnedSizes(self):
+        """Get the sizes of data owned but not referenced by this widget.
+
+        The sizes are returned as a dictionary mapping category names to
+        sizes in bytes.  Connected event handlers are only referenced by
+        wx, so their total size is recorded as they are made.
+        """
+        return {"handlers": self._handlerBytes}
+
+    ##  Methods for dealing with XRC resource files
+
+    @classmethod
+    def _findXRCFile(cls):
+        """Locate the XRC file for this class, and return its location.
+
+        The name of the XRC file is constructed from the name of the class
+        and its defining module.  If this class is named <ClassName> and is
+        defined in module <TopLevel>.<SubLevel>.<Package>, then the XRC file
+        searched for will be <TopLevel>/<SubLevel>/<Package>.xrc
+        The locations within the filesystem which are to be searched are
+        obtained from the _getXRCFileLocations() method, and may include
+        zip archives such as those found on sys.path.  If it is not found
+        there, the file is requested from the loader of the package
+        <TopLevel>.<SubLevel>.  A gzipped file with an additional ".gz"
+        extension will be used if an uncompressed file is not found.
+
+        If the class-level attribute _xrcdata is set, no search is done
+        and the data it contains is used directly.
+        """
+        if cls._xrcdata is not None:
+            return resources.addData(cls._xrcdata)
+        if cls._xrcfilename is None:
+            filePath =  "/".join(cls.__module__.split(".")) + ".xrc"
+        else:
+            filePath = cls._xrcfilename
+        for fp in (filePath,filePath + ".gz"):
+            for fileLoc in cls._getXRCFileLocations():
+                pth = os.path.join(fileLoc,fp)
+                if resources.exists(pth):
+                    return pth
+            pkgParts = fp.split("/")
+            if len(pkgParts) > 1:
+                pkgName = ".".join(pkgParts[:-1])
+                pth = resources.packageLocation(pkgName,pkgParts[-1])
+                if resources.exists(pth):
+                    return pth
+        raise XRCWidgetsError("XRC File '%s' could not be found" % (filePath,))
+
+    @staticmethod
+    def _getXRCFileLocations():
+        """Iterator over the possible locations where XRC files are kept.
+
+        XRC files can be found in the following places:
+
+            * the directories in sys.path
+            * <sys.prefix>/share/XRCWidgets/data
+
+        """
+        for p in sys.path:
+            yield p
+        yield os.path.normpath(os.path.join(sys.prefix,"share/XRCWidgets/data"))
+
+    def _loadXRCFile(self,fileNm,pre,parent):
+        """Load this object's definitions from an XRC file.
+
+        The file at <fileNm> should be an XRC file containing a resource
+        with the same name as this class.  This resource's definition
+        will be loaded into the current object using two-stage initialisation.
+        <pre> must be the pre-initialised widget object to load into, and 
+        <parent> must be the desired parent of the to-be-created widget.
+
+        The class-level attribute _xrcname may be used to specify an alternate
+        name for the resource, rather than the class name.
+
+        If a module generated from the XRC file is available, it is used to
+        create the widget instead.
+        """
+        if self._xrcname is None:
+            self._xrcname = self.__class__.__name__
+        loader = self._getGeneratedLoader(self._xrcname)
+        if loader is not None:
+            loader(pre,parent)
+        else:
+            xrcres = _getXmlResource(fileNm)
+            self._loadOn(xrcres,pre,parent,self._xrcname)
+        self.PostCreate(pre)
+        self._bindPooledClose()
+        self.on_create()
+
+    def _getGeneratedLoader(self,rName):
+        """Get the generated loader function for resource <rName>.
+
+        None is returned if generated code is not in use, or is not available
+        for that resource.  Any magic methods recorded for this class in the
+        generated module are also made available to _getMagicMethods().
+        """
+        if not self._useGeneratedCode:
+            return None
+        mod = _getGeneratedModule(self._xrcfile)
+        if mod is None:
+            return None
+        _useGeneratedMagic(self.__class__,mod)
+        return mod.LOADERS.get(rName)
+
+    @classmethod
+    def preload(cls):
+        """Do the work of creating an instance of this class ahead of time.
+
+        The XRC file is located and loaded (or its generated module
+        imported), the resource index and table of child IDs are built, and
+        the magic methods of the class are found, so that none of this
+        needs to be done when the first instance is created.
+
+        This must be called after the wx.App has been created.  It is
+        normally called by XRCWidgets.startup.preload().
+        """
+        location = cls._xrcfile
+        if location is None:
+            location = _getXRCFileLocation(cls)
+        rName = cls._xrcname
+        if rName is None:
+            rName = cls.__name__
+        loader = None
+        if cls._useGeneratedCode:
+            mod = _getGeneratedModule(location)
+            if mod is not None:
+                _useGeneratedMagic(cls,mod)
+                loader = mod.LOADERS.get(rName)
+        if loader is None:
+            _getXmlResource(location)
+        cls._getMagicMethods()
+        def makeTree():
+            return XMLDocTree(BytesIO(resources.getData(location)))
+        getIndex(location,rName,makeTree).getIds(xrc.XRCID)
+
+    def _makeXmlTree(self):
+        """Populate self._xmltree with a representation of the XRC file."""
+        if self._xrcname is None:
+            self._xrcname = self.__class__.__name__
+        if self._xmltree is None:
+            xmlfile = BytesIO(resources.getData(self._xrcfile))
+            self._xmltree = XMLDocTree(xmlfile)
+
+    def _getIndex(self):
+        """Get the XRCIndex describing this object's resource."""
+        if self._xrcindex is None:
+            if self._xrcname is None:
+                self._xrcname = self.__class__.__name__
+            self._xrcindex = getIndex(self._xrcfile,self._xrcname,
+                                      self._getXmlTree)
+        return self._xrcindex
+
+    def _getXmlTree(self):
+        """Get the XMLDocTree representing the XRC file."""
+        self._makeXmlTree()
+        return self._xmltree
+
+    ##  Methods for loading deferred content
+
+    def _setupDeferredContent(self):
+        """Prepare to load the resources listed in _deferredContent.
+
+        Placeholders that are not shown will load their content when they
+        are first shown.  The names of those that are already shown are
+        returned, so that on_create() can load their content once the other
+        magic methods have been connected.
+        """
+        shown = []
+        for (phName,resName) in self._deferredContent.items():
+            placeholder = self._getPlaceholder(phName)
+            idx = getIndex(self._xrcfile,resName,self._getXmlTree)
+            self._deferredNames[phName] = phName
+            for cName in idx.names:
+                self._deferredNames[cName] = phName
+            if placeholder.IsShown():
+                shown.append(phName)
+            else:
+                hndlr = lcurry(self._onDeferredShow,phName)
+                placeholder.Bind(wx.EVT_SHOW,hndlr)
+        return shown
+
+    def _getPlaceholder(self,phName):
+        """Get the named placeholder for deferred content."""
+        placeholder = self.FindWindowById(self.getChildId(phName))
+        if placeholder is None:
+            raise XRCWidgetsError("Child '%s' not found" % (phName,))
+        return placeholder
+
+    def _onDeferredShow(self,phName,evt):
+        evt.Skip()
+        if evt.GetShow():
+            self.loadDeferred(phName)
+
+    def loadDeferred(self,phName):
+        """Load the deferred content for the named placeholder.
+
+        The resource named for the placeholder in _deferredContent is loaded
+        and displayed inside it, and any magic methods for its children are
+        connected.  If this happens before on_create() has connected the
+        other magic methods, those of the content are connected along with
+        them instead.  The loaded content is returned.  If it has already been
+        loaded, it is simply returned again.
+        """
+        try:
+            return self._deferredLoaded[phName]
+        except KeyError:
+            pass
+        resName = self._deferredContent[phName]
+        placeholder = self._getPlaceholder(phName)
+        loader = self._getGeneratedLoader(resName)
+        if loader is not None:
+            content = wx.PrePanel()
+            loader(content,placeholder)
+        else:
+            xrcres = _getXmlResource(self._xrcfile)
+            content = xrcres.LoadPanel(placeholder,resName)
+        if content is None:
+            eStr = "Resource '%s' could not be loaded" % (resName,)
+            raise XRCWidgetsError(eStr)
+        self._deferredLoaded[phName] = content
+        cNames = []
+        for (cName,ph) in list(self._deferredNames.items()):
+            if ph == phName:
+                cNames.append(cName)
+                del self._deferredNames[cName]
+        self._validationNames = None
+        self.showInWindow(placeholder,content)
+        if self._eventsConnected:
+            if self._useMagicMethods or self._validators:
+                self._connectEventMethods(cNames)
+        return content
+
+    ##  Methods for obtaining references to child widgets
+
+    def getChild(self,cName):
+        """Lookup and return a child widget by name."""
+        # This can be done in two ways.  Hopefully, the child has been
+        # picked up by xrc and can be found by its ID.  Names from our
+        # resource have their ID in the index.  If not, the child's class
+        # is found in the index and the lookup is passed to the appropriate
+        # _getChild_<class> method.  Windows from outside our resource
+        # (e.g. those of widgets nested inside this one, or added at runtime
+        # with an XRC name) are found by their window name, which the XRC
+        # loader sets to their XRC name.  Only other names need the XRC file
+        # to be parsed, and unknown names fail without allocating an ID.
+        # Deferred content containing the child is loaded first.
+        if cName in self._deferredNames:
+            self.loadDeferred(self._deferredNames[cName])
+        cId = self._getIds().get(cName)
+        chld = None
+        if cId is not None:
+            chld = self.FindWindowById(cId)
+        if chld is None:
+            cls = self._getIndex().types.get(cName)
+            if cls is None:
+                chld = self.FindWindowByName(cName)
+                if chld is not None:
+                    return chld
+                # Find XML data on the named child, if possible
+                cls = self._getXmlData(cName).attrs.get("class")
+            # Pass the lookup off to the method for the object's class
+            mthdNm = "_getChild_%s" % (cls,)
+            try:
+                mthd = getattr(self,mthdNm)
+            except AttributeError:
+                raise XRCWidgetsError("Child '%s' of unsupported type '%s'"%(cName,cls,))
+            chld = mthd(cName)
+            if chld is None:
+                raise XRCWidgetsError("Child '%s' not found" % (cName,))
+        return chld
+
+
+    def _getXmlData(self,cName):
+        """Get the XMLElementData for the named child from the XRC file."""
+        self._makeXmlTree()
+        try:
+            return self._xmltree.elements[cName]
+        except KeyError:
+            raise XRCWidgetsError("Child '%s' not found" % (cName,))
+
+
+    def getChildId(self,cName):
+        """Obtain the numeric ID of the named child.
+
+        IDs of children from this widget's resource are found in the index,
+        without needing to consult wx's global table of XRC IDs.  This means
+        that unknown names will cause an error rather than being allocated
+        a new ID.
+        """
+        try:
+            return self._getIds()[cName]
+        except KeyError:
+            pass
+        chld = self.getChild(cName)
+        try:
+            return chld.GetId()
+        except AttributeError:
+            pass
+        raise XRCWidgetsError("Child '%s' could not be found" % cName)
+
+
+    def getChildType(self,cName):
+        """Determine the type of the named child.
+
+        The type is returned as a string, typically the 'class' attribute of
+        the defining element in the XRC file.  For example, "wxTextCtrl" or
+        "wxListBox".
+        """
+        cType = self._getIndex().types.get(cName)
+        if cType is not None:
+            return cType
+        self._makeXmlTree()
+        data = self._xmltree.elements[cName]
+        try:
+            return data.attrs["class"]
+        except KeyError:
+            pass
+        eStr = "Type of child '%s' could not be determined"
+        raise XRCWidgetsError(eStr % (cName,))
+
+
+    def _getIds(self):
+        """Get the dictionary mapping names of children to their IDs."""
+        return self._getIndex().getIds(xrc.XRCID)
+
+
+    def _getValueChildren(self):
+        """Get the names of all children that have a value.
+
+        A child has a value if there is an entry for its type in the
+        _valueAccessors dictionary.  The list is calculated only once.
+        """
+        if self._valueChildren is None:
+            idx = self._getIndex()
+            self._valueChildren = idx.namesOfType(self._valueAccessors)
+        return self._valueChildren
+
+
+    def _getValueAccessors(self,cName):
+        """Get names of the (getter,setter) methods for the named child."""
+        cType = self._getIndex().types.get(cName)
+        if cType is None:
+            cType = self.getChildType(cName)
+        try:
+            return self._valueAccessors[cType]
+        except KeyError:
+            eStr = "Child '%s' of type '%s' does not have a value"
+            raise XRCWidgetsError(eStr % (cName,cType))
+
+
+    def getValues(self):
+        """Get the values of all value-bearing children.
+
+        The values are returned as a dictionary mapping child names to
+        values, suitable for passing back into setValues().
+        """
+        values = {}
+        types = self._getIndex().types
+        for cName in self._getValueChildren():
+            getter = self._valueAccessors[types[cName]][0]
+            values[cName] = getattr(self.getChild(cName),getter)()
+        return values
+
+
+    def setValues(self,values):
+        """Set the values of children from the given mapping.
+
+        <values> must map child names to the new value of that child, as
+        returned by getValues().  All children are updated while the widget
+        is frozen, so the changes are displayed in a single repaint.
+        """
+        # Resolve everything before freezing, so errors leave things untouched
+        updates = []
+        for (cName,value) in values.items():
+            setter = self._getValueAccessors(cName)[1]
+            updates.append((getattr(self.getChild(cName),setter),value))
+        self.Freeze()
+        try:
+            for (setter,value) in updates:
+                setter(value)
+        finally:
+            self.Thaw()
+
+
+    # The following methods are specially-named so they can be found easily
+    # Each is named of the form _getChild_<class> where <class> is the
+    # requested object's class attribute from the XRC file.  Each will
+    # accept the name of the requested widget and will attempt to return
+    # a reference to it, using the resource index where possible.
+
+
+    def _getChild_wxMenuItem(self,cName):
+        """Get a reference to a wxMenuItem widget.
+
+        The item is looked up by its ID in the menubar containing it, which
+        is found from the resource index.  Items of menus that are not in a
+        menubar are looked up by their label instead.
+        """
+        cId = self._getIds().get(cName)
+        if cId is not None:
+            mbar = self._getMenuBarOf(cName)
+            if mbar is not None:
+                item = mbar.FindItemById(cId)
+                if item is not None:
+                    return item
+        return self._findMenuItem(self._getXmlData(cName))
+
+    def _getChild_wxMenu(self,cName):
+        """Get a reference to a wxMenu widget."""
+        return self._findMenu(self._getXmlData(cName))
+
+    def _getChild_wxMenuBar(self,cName):
+        """Get a reference to a wxMenuBar widget.
+
+        The XRC loader does not give menu bars an ID, so it is obtained
+        from the GetMenuBar() method of its closest named ancestor, which
+        is found from the resource index.
+        """
+        pName = self._getIndex().parents.get(cName)
+        if pName is None or pName == self._xrcname:
+            parent = self
+        else:
+            parent = self.getChild(pName)
+        try:
+            return parent.GetMenuBar()
+        except AttributeError:
+            eStr = "Child '%s' unreachable from parent." % (cName,)
+            raise XRCWidgetsError(eStr)
+
+    def _getMenuBarOf(self,cName):
+        """Get the menubar containing the named menu or item, or None."""
+        idx = self._getIndex()
+        pName = idx.parents.get(cName)
+        while pName is not None and idx.types.get(pName) == "wxMenu":
+            pName = idx.parents.get(pName)
+        if pName is not None and idx.types.get(pName) == "wxMenuBar":
+            return self.getChild(pName)
+        if pName is None or pName == self._xrcname:
+            owner = self
+        else:
+            owner = self.getChild(pName)
+        try:
+            return owner.GetMenuBar()
+        except AttributeError:
+            return None
+
+
+    # The following methods find menus and their items from their data in
+    # the XRC file, for those that can't be found using the resource index.
+
+    def _findMenuItem(self,data):
+        """Find a wxMenuItem widget from its XMLElementData.
+
+        This requires finding the containing wxMenu widget (assumed to be
+        the immediate parent) then looking it up by its label, which is
+        found in the immediate children.
+        """
+        # Get the containing menu
+        mData = data.parent
+        if mData.attrs.get("class") != "wxMenu":
+            eStr = "Child '%s' has incorrect parent" % (data.attrs["name"],)
+            raise XRCWidgetsError(eStr)
+        menu = self._findMenu(mData)
+            
+        # Determine the item label.  If it has a single underscore, remove
+        # it as it will be an accelerator key.  If it has more than one,
+        # leave it alone. TODO: how does XRC respond in this case?
+        # Also remove anything following a tab, as it's an accelerator
+        # indicator.
+        lbl = None
+        for c in data.children:
+            if isinstance(c,XMLElementData) and c.name == "label":
+                lbl = c.children[0]
+        if lbl is None:
+            eStr = "Child '%s' has no label" % (data.attrs["name"],)
+            raise XRCWidgetsError(eStr)
+        lblParts = lbl.split("_")
+        if len(lblParts) == 2:
+            lbl = "".join(lblParts)
+        lbl = lbl.split("\t")[0]
+        # Get and return the widget
+        for item in menu.GetMenuItems():
+            if item.GetLabel() == lbl:
+                return item
+ 
+
+    def _findMenu(self,data):
+        """Find a wxMenu widget from its XMLElementData.
+
+        This requires finding the containing widget, which is either a
+        wxMenu or a wxMenuBar, and applying the appropriate method to
+        find the menu by label.
+        """
+        # Determine the item label
+        lbl = None
+        for c in data.children:
+            if isinstance(c,XMLElementData) and c.name == "label":
+                lbl = c.children[0]
+        if lbl is None:
+            eStr = "Child '%s' has no label" % (data.attrs["name"],)
+            raise XRCWidgetsError(eStr)
+        lblParts = lbl.split("_")
+        if len(lblParts) == 2:
+            lbl = "".join(lblParts)
+        # Find parent widget, get and return reference
+        mData = data.parent
+        cls = mData.attrs.get("class")
+        if cls == "wxMenu":
+            menu = self._findMenu(mData)
+            for item in menu.GetMenuItems():
+                if item.GetLabel() == lbl:
+                    return item.GetSubMenu()
+            eStr = "Child '%s' has incorrect parent" % (data.attrs["name"],)
+            raise XRCWidgetsError(eStr)
+        elif cls == "wxMenuBar":
+            menu = self._findMenuBar(mData)
+            return menu.GetMenu(menu.FindMenu(lbl))
+        else:
+            eStr = "Child '%s' has incorrect parent" % (data.attrs["name"],)
+            raise XRCWidgetsError(eStr)
+ 
+
+    def _findMenuBar(self,data):
+        """Find a wxMenuBar widget from its XMLElementData.
+
+        The XRC loader does not give menu bars an ID, so it is obtained
+        from the parent widget's GetMenuBar() method.
+        This could probably be done more reliablly - suggestions welcome!
+        """
+        cName = data.attrs["name"]
+        parent = self.getChild(data.parent.attrs["name"])
+        try:
+            mbar = parent.GetMenuBar()
+            return mbar
+        except AttributeError:
+            eStr = "Child '%s' unreachable from parent." % (cName,)
+            raise XRCWidgetsError(eStr)
+
+
+    def _getChild_wxToolBar(self,cName):
+        """Get a reference to a wxToolBar widget.
+
+        As for wxMenuBar, this first checks whether XRCCTRL has a reference
+        to it, and if not attempts to obtain it from the GetToolBar() method
+        of its closest named ancestor.
+        """
+        tbar = xrc.XRCCTRL(self,cName)
+        if tbar is not None:
+            return tbar
+        pName = self._getIndex().parents.get(cName)
+        if pName is None or pName == self._xrcname:
+            parent = self
+        else:
+            parent = self.getChild(pName)
+        try:
+            return parent.GetToolBar()
+        except AttributeError:
+            eStr = "Child '%s' unreachable from parent." % (cName,)
+            raise XRCWidgetsError(eStr)
+
+
+    def _getChild_tool(self,cName):
+        """Get a reference to a tool within a wxToolBar.
+
+        The containing toolbar is found from the resource index, and the
+        tool is then looked up by its ID.  If the toolbar is unnamed it is
+        assumed to be this widget's toolbar.
+        """
+        try:
+            tbName = self._getIndex().tools[cName]
+        except KeyError:
+            eStr = "Child '%s' has incorrect parent" % (cName,)
+            raise XRCWidgetsError(eStr)
+        if tbName is None:
+            tbar = self.GetToolBar()
+        else:
+            tbar = self.getChild(tbName)
+        return tbar.FindById(self.getChildId(cName))
+
+
+    def _getChild_notebookpage(self,cName):
+        """Get a reference to the window displayed in a notebook page.
+
+        The containing notebook and the index of the page within it are
+        found from the resource index.
+        """
+        try:
+            (bookName,pageIdx) = self._getIndex().pages[cName]
+        except KeyError:
+            eStr = "Child '%s' has incorrect parent" % (cName,)
+            raise XRCWidgetsError(eStr)
+        return self.getChild(bookName).GetPage(pageIdx)
+
+    _getChild_listbookpage = _getChild_notebookpage
+    _getChild_choicebookpage = _getChild_notebookpage
+    _getChild_treebookpage = _getChild_notebookpage
+    _getChild_toolbookpage = _getChild_notebookpage
+
+
+    ##
+    ##  Methods for manipulating child widgets
+    ##
+
+    def createInChild(self,cName,toCreate,*args):
+        """Create a Widget inside the named child.
+
+        <toCreate> should be a callable (usually a class) returning the widget
+        instance. It must take the new widget's parent as first argument. It
+        will be called as:
+
+            toCreate(self.getChild(cName),*args)
+
+        The newly created widget will be displayed as the only content of the
+        named child, expanded inside a sizer.  A reference to it will also be
+        returned.
+        """
+        chld = self.getChild(cName)
+        newWidget = toCreate(chld,*args)
+        self.showInWindow(chld,newWidget)
+        return newWidget
+
+
+    def showInChild(self,cName,widget):
+        """Show the given widget inside the named child.
+
+        The widget is expected to have the child as its parent.  It will be
+        shown in an expandable sizer as the child's only content.
+        """
+        self.showInWindow(self.getChild(cName),widget)
+
+
+    def replaceInChild(self,cName,widget):
+        """As with showInChild, but destroys the child's previous contents."""
+        self.replaceInWindow(self.getChild(cName),widget)
+
+
+    def showInWindow(self,window,widget):
+        """Show the given widget inside the given window.
+
+        The widget is expected to have the window as its parent.  It will be
+        shown in an expandable sizer as the windows's only content.
+        Any widgets that are currently children of the window will be hidden,
+        and a list of references to them will be returned.
+        """
+        oldChildren = []
+        sizer = window.GetSizer()
+        if sizer is None:
+            sizer = wx.BoxSizer(wx.HORIZONTAL)
+        else:
+            # I dont understand th behavior of GetChildren().  The list appears
+            # to include duplicate entries for children we have created, and
+            # sometimes has links to Dead C++ objects.  Filter out the dead
+            # or repeated entries from the list.
+            for c in window.GetChildren():
+                if c:
+                    sizer.Remove(c)
+                    if c is not widget:
+                        c.Hide()
+                        if c not in oldChildren:
+                            oldChildren.append(c)
+        sizer.Add(widget,1,wx.EXPAND|wx.ADJUST_MINSIZE)
+        widget.Show()
+        sizer.Layout()
+        window.SetSizer(sizer,False)
+        window.Layout()
+        return oldChildren
+ 
+    def replaceInWindow(self,window,widget):
+        """As with showInWindow, but destroys the window's previous contents.
+        Does not return a list of references.
+        """
+        oldChildren = self.showInWindow(window,widget)
+        for c in oldChildren:
+            c.Destroy()
+
+
+    ##
+    ##  Methods for updating child widgets from other threads
+    ##
+
+    def queueUpdate(self,cName,value,method=None):
+        """Queue an update to the named child, to be applied in the GUI thread.
+
+        This method may safely be called from any thread.  When the update
+        is applied, the named method of the child will be called with the
+        given value.  If <method> is not given, the child's value will be
+        set as for setValues().
+
+        Updates are coalesced, so that if several updates to the same method
+        of the same child are queued before being applied, only the most
+        recent one takes effect.  All queued updates are applied together
+        with the widget frozen, so they are displayed in a single repaint.
+        """
+        self._updateLock.acquire()
+        try:
+            key = (cName,method)
+            self._pendingUpdates.pop(key,None)
+            self._pendingUpdates[key] = value
+            if self._updateScheduled:
+                return
+            self._updateScheduled = True
+        finally:
+            self._updateLock.release()
+        self._scheduleUpdates()
+
+
+    def _scheduleUpdates(self):
+        """Arrange for _applyUpdates() to be called in the GUI thread."""
+        if self._updateInterval > 0:
+            wx.CallAfter(wx.CallLater,self._updateInterval,self._applyUpdates)
+        else:
+            wx.CallAfter(self._applyUpdates)
+
+
+    def _applyUpdates(self):
+        """Apply updates queued by queueUpdate().
+
+        Updates are applied in the order they were queued, until they are
+        exhausted or the time limit given by _updateBudget has passed.
+        Any remaining updates are re-queued for the next batch.
+        """
+        # The widget may have been destroyed while updates were pending
+        if not self:
+            return
+        self._updateLock.acquire()
+        try:
+            updates = self._pendingUpdates
+            self._pendingUpdates = OrderedDict()
+        finally:
+            self._updateLock.release()
+        deadline = time.time() + self._updateBudget
+        try:
+            self.Freeze()
+            try:
+                while updates:
+                    ((cName,method),value) = updates.popitem(last=False)
+                    if method is None:
+                        method = self._getValueAccessors(cName)[1]
+                    getattr(self.getChild(cName),method)(value)
+                    if time.time() >= deadline:
+                        break
+            finally:
+                self.Thaw()
+        finally:
+            self._requeueUpdates(updates)
+
+
+    def _requeueUpdates(self,updates):
+        """Re-queue updates that were not applied by _applyUpdates()."""
+        self._updateLock.acquire()
+        try:
+            # Keep leftover updates ahead of any queued in the meantime
+            for (key,value) in self._pendingUpdates.items():
+                updates.pop(key,None)
+                updates[key] = value
+            self._pendingUpdates = updates
+            if not updates:
+                self._updateScheduled = False
+                return
+        finally:
+            self._updateLock.release()
+        self._scheduleUpdates()
+
+
+    ##
+    ##  Methods for validating the values of children
+    ##
+
+    def validate(self,cNames=None):
+        """Run the validators affected by the named children.
+
+        Only the validators of the named children, and of children whose
+        validators depend on them, are run.  If <cNames> is None every
+        validator is run, which is useful before accepting the contents of
+        a form.  Children whose validity has changed are then decorated in
+        a single pass.  A dictionary mapping the names of all invalid
+        children to their error messages is returned.
+
+        This is called automatically when a child affecting validation is
+        changed by the user.
+        """
+        plan = _getValidationPlan(self.__class__)
+        targets = plan.getTargets(cNames)
+        results = plan.run(targets,self._getChildValue)
+        changed = []
+        for cName in targets:
+            error = results[cName]
+            if self._validationErrors.get(cName) != error:
+                changed.append((cName,error))
+                if error is None:
+                    del self._validationErrors[cName]
+                else:
+                    self._validationErrors[cName] = error
+        if changed:
+            self._decorateErrors(changed)
+        return dict(self._validationErrors)
+
+    def getErrors(self):
+        """Get the errors found by the validators run so far.
+
+        A dictionary is returned mapping the names of invalid children to
+        their error messages.
+        """
+        return dict(self._validationErrors)
+
+    def isValid(self):
+        """Check that no errors were found by the validators run so far."""
+        return not self._validationErrors
+
+    def clearErrors(self):
+        """Forget all errors found so far, and remove their decorations."""
+        changed = [(cName,None) for cName in self._validationErrors]
+        self._validationErrors = {}
+        if changed:
+            self._decorateErrors(changed)
+
+    def decorateError(self,cName,error):
+        """Show or clear the validation error of the named child.
+
+        <error> is the error message, or None if the child is now valid.
+        By default the child's background is set to _errorColour, and its
+        tooltip shows the message.  Subclasses may override this to show
+        errors differently.
+        """
+        child = self.getChild(cName)
+        if error is None:
+            child.SetBackgroundColour(wx.NullColour)
+            tip = self._savedTooltips.pop(cName,None)
+            if tip:
+                child.SetToolTipString(tip)
+            else:
+                child.SetToolTip(None)
+        else:
+            if cName not in self._savedTooltips:
+                tip = child.GetToolTip()
+                if tip is not None:
+                    tip = tip.GetTip()
+                self._savedTooltips[cName] = tip
+            child.SetBackgroundColour(self._errorColour)
+            child.SetToolTipString(error)
+        child.Refresh()
+
+    def _decorateErrors(self,changed):
+        """Call decorateError() for each (name,error) pair in <changed>.
+
+        The widget is frozen while this is done, so that all the changes
+        are displayed in a single repaint.
+        """
+        self.Freeze()
+        try:
+            for (cName,error) in changed:
+                self.decorateError(cName,error)
+        finally:
+            self.Thaw()
+
+    def _getChildValue(self,cName):
+        getter = self._getValueAccessors(cName)[0]
+        return getattr(self.getChild(cName),getter)()
+
+    def _onValidatedChange(self,child):
+        """Handle a change to a child that affects validation.
+
+        This is connected in place of the child's 'change' magic method, if
+        it has one, which is called before the validators are run.
+        """
+        if self._validationNames is None:
+            # Children in deferred content that hasn't been loaded can't
+            # have sent the event, so they are skipped rather than loaded
+            ids = self._getIds()
+            names = {}
+            for cName in _getValidationPlan(self.__class__).affected:
+                if cName in self._deferredNames:
+                    continue
+                cId = ids.get(cName)
+                if cId is None:
+                    cId = self.getChildId(cName)
+                names[cId] = cName
+            self._validationNames = names
+        cName = self._validationNames[child.GetId()]
+        if self._useMagicMethods:
+            hndlr = getattr(self,"on_%s_change" % (cName,),None)
+            if hndlr is not None and callable(hndlr):
+                hndlr(child)
+        self.validate((cName,))
+
+
+    ##
+    ##  Methods for pooling of pre-built widgets
+    ##
+
+    @classmethod
+    def acquire(cls,*args,**kwds):
+        """Get an instance of this class, from its pool if it has one.
+
+        This is equivalent to XRCWidgets.pool.acquire(cls,*args,**kwds).
+        """
+        return pool.acquire(cls,*args,**kwds)
+
+    def on_acquire(self,*args,**kwds):
+        """Prepare a pooled widget to be used.
+
+        This is called with the arguments given to acquire() each time the
+        widget is handed out from its pool, and may be overridden to set up
+        the widget for a particular use.
+        """
+        pass
+
+    def on_release(self):
+        """Reset a pooled widget before it is returned to its pool.
+
+        By default nothing is done, as the values of all children are
+        restored automatically to those they had when the widget was first
+        created.  Subclasses may override this to reset other state.
+        """
+        pass
+
+    def _setWidgetPool(self,widgetPool):
+        """Record that this widget is managed by the given pool."""
+        self._widgetPool = widgetPool
+        self._pooledValues = {}
+        for cName in self._getValueChildren():
+            if cName not in self._deferredNames:
+                getter = self._getValueAccessors(cName)[0]
+                value = getattr(self.getChild(cName),getter)()
+                self._pooledValues[cName] = value
+
+    def _resetPooled(self):
+        """Restore a pooled widget to its initial state."""
+        self._poolReleases += 1
+        self.setValues(self._pooledValues)
+        self.clearErrors()
+        self.on_release()
+
+    def _bindPooledClose(self):
+        """Bind the EVT_CLOSE handler that returns pooled widgets to the pool.
+
+        This is done before on_create() is called, so that any close
+        handlers bound by the subclass are run first and may veto the close.
+        """
+        if isinstance(self,wx.TopLevelWindow):
+            self.Bind(wx.EVT_CLOSE,self._onPooledClose)
+
+    def _onPooledClose(self,evt):
+        if evt.CanVeto() and evt.GetVeto():
+            return
+        if self._widgetPool is None or not evt.CanVeto():
+            evt.Skip()
+        elif isinstance(self,wx.Dialog) and self.IsModal():
+            #  Let wx end the modal loop; ShowModal() returns us to the pool
+            evt.Skip()
+        else:
+            self.Destroy()
+
+    def _releaseAfterModal(self,releases):
+        """Return a pooled dialog to its pool after ShowModal() has ended.
+
+        Nothing is done if the dialog has been returned to its pool since
+        the modal loop ended, or has been shown again.
+        """
+        if not self or self._widgetPool is None:
+            return
+        if self._poolReleases == releases and not self.IsShown():
+            self.Destroy()
+
+    def Destroy(self):
+        """Destroy the widget, or return it to its pool if it has one."""
+        if self._widgetPool is not None and self:
+            if self._widgetPool.release(self):
+                return True
+            self._widgetPool = None
+        return super(XRCWidget,self).Destroy()
+
+
+    ##
+    ##  Methods for helping to connect event handlers
+    ##
+
+    def _connectEventMethods(self,cNames=None):
+        """Automatically connect specially named methods as event handlers.
+
+        An XRCWidget subclass may provide any number of methods named in the
+        form 'on_<cname>_<action>' where <cname> is the name of a child
+        widget from the XRC file and <action> is an event identifier appropiate
+        for that widget type.  This method sets up the necessary event
+        connections to ensure that such methods are called when appropriate.
+
+        Children that affect the validators listed in _validators are also
+        connected, so that the validators are run when they change.
+
+        If <cNames> is given, only methods for the children it lists are
+        connected.  Otherwise, methods for children in deferred content that
+        has not yet been loaded are skipped.
+        """
+        connectors = _getSharedConnectors()
+        def wanted(cName):
+            if cNames is None:
+                return cName not in self._deferredNames
+            return cName in cNames
+        validated = {}
+        if self._validators:
+            validated = _getValidationPlan(self.__class__).affected
+            for cName in sorted(validated.keys()):
+                if not wanted(cName):
+                    continue
+                cType = self.getChildType(cName)
+                if not connectors["change"].supports(cType):
+                    eStr = "Child '%s' can't be validated: widget type <%s>"
+                    eStr = eStr + " has no 'change' action."
+                    raise XRCWidgetsError(eStr % (cName,cType))
+        magic = ()
+        if self._useMagicMethods:
+            magic = self._getMagicMethods()
+        for (mName,cName,action) in magic:
+            if not wanted(cName):
+                continue
+            if action == "change" and cName in validated:
+                # This is called by _onValidatedChange() instead
+                continue
+            hndlr = getattr(self,mName)
+            if not callable(hndlr):
+                continue
+            self._connectEventMethod(connectors[action],cName,hndlr)
+        for cName in validated:
+            if wanted(cName):
+                self._connectEventMethod(connectors["change"],cName,
+                                         self._onValidatedChange)
+
+    def _connectEventMethod(self,connector,cName,hndlr):
+        """Connect <hndlr> to the named child using the given connector."""
+        if not connector.connect(cName,self,hndlr):
+            eStr = "Widget type <%s> not supported by"
+            eStr = eStr + " '%s' action."
+            cType = self.getChildType(cName)
+            raise XRCWidgetsError(eStr % (cType,connector.action))
+
+    @classmethod
+    def _getMagicMethods(cls):
+        """Find the magic methods that should be connected for this class.
+
+        The methods are returned as a list of (method name,child name,action)
+        tuples.  This is calculated only once for each class.
+        """
+        try:
+            return _magicMethods[cls]
+        except KeyError:
+            pass
+        prfx = "on_"
+        actions = _getSharedConnectors().keys()
+        magic = []
+        for mName in dir(cls):
+            if mName.startswith(prfx):
+                for action in actions:
+                    sffx = "_"+action
+                    if mName.endswith(sffx):
+                        cName = mName[len(prfx):-1*len(sffx)]
+                        magic.append((mName,cName,action))
+                        break
+        _magicMethods[cls] = magic
+        return magic
+
+
+
+# Location of the XRC file for each XRCWidget class
+_xrcFileLocations = memory.registerCache("locations",LRUCache())
+
+def _getXRCFileLocation(cls):
+    """Get the location of the XRC file for the given class.
+
+    This is found using the class's _findXRCFile() method, and remembered
+    for use by future instances.
+    """
+    try:
+        return _xrcFileLocations[cls]
+    except KeyError:
+        pass
+    location = cls._findXRCFile()
+    _xrcFileLocations[cls] = location
+    return location
+
+
+# Magic methods found for each XRCWidget class
+_magicMethods = memory.registerCache("magicmethods",
+                                     LRUCache(sizeof=memory.sizeOfValue))
+
+def _useGeneratedMagic(cls,mod):
+    """Use the magic methods of <cls> recorded in generated module <mod>.
+
+    They are only used if they have not already been found, and the module
+    is newer than the one defining the class.
+    """
+    if cls not in _magicMethods:
+        magic = mod.MAGIC.get("%s.%s" % (cls.__module__,cls.__name__))
+        if magic is not None and codegen.isNewerThanClass(mod,cls):
+            _magicMethods[cls] = [tuple(m) for m in magic]
+
+# Compiled validators for each XRCWidget class
+_validationPlans = memory.registerCache("validation",LRUCache())
+
+def _getValidationPlan(cls):
+    """Get the ValidationPlan compiled from the _validators of <cls>."""
+    try:
+        return _validationPlans[cls]
+    except KeyError:
+        pass
+    plan = ValidationPlan(cls._validators)
+    _validationPlans[cls] = plan
+    return plan
+
+# Connectors shared by all widgets, created on first use
+_sharedConnectors = []
+
+def _getSharedConnectors():
+    """Get the dictionary of connectors shared by all widgets."""
+    if not _sharedConnectors:
+        _sharedConnectors.append(getConnectors())
+    return _sharedConnectors[0]
+
+
+# Widgets whose on_create() has been batched by _handle_on_create()
+_pendingCreates = []
+
+def _runPendingCreates():
+    """Run on_create() for all widgets batched by _handle_on_create().
+
+    The top-level windows containing the widgets are frozen while this is
+    done, and laid out once at the end.
+    """
+    widgets = _pendingCreates[:]
+    del _pendingCreates[:]
+    tops = []
+    for widget in widgets:
+        if widget:
+            top = widget.GetTopLevelParent()
+            if top is not None and top not in tops:
+                top.Freeze()
+                tops.append(top)
+    try:
+        for widget in widgets:
+            if widget:
+                widget.on_create()
+    finally:
+        for top in tops:
+            top.Thaw()
+            top.Layout()
+
+
+# Modules generated by XRCWidgets.codegen, keyed by XRC file location.
+# None is stored for locations that have no up-to-date generated module.
+_generatedModules = memory.registerCache("generated",LRUCache())
+
+def _getGeneratedModule(fileNm):
+    """Get the generated module for the XRC file at the given location."""
+    try:
+        return _generatedModules[fileNm]
+    except KeyError:
+        pass
+    mod = codegen.loadGenerated(fileNm)
+    _generatedModules[fileNm] = mod
+    return mod
+
+
+# Loaded wx resource objects, keyed by XRC file location.  These are
+# shared by all widgets loaded from the same location.  Their size is
+# taken to be the size of the XRC data they were loaded from.
+def _sizeOfXmlResource(fileNm,xrcres):
+    if resources.isPlainFile(fileNm):
+        return os.path.getsize(fileNm)
+    return len(resources.getData(fileNm))
+_xmlResources = LRUCache(sizeof=_sizeOfXmlResource)
+memory.registerCache("xmlresource",_xmlResources)
+
+def _getXmlResource(fileNm):
+    """Get the xrc.XmlResource for the XRC file at the given location.
+
+    Unless it has been disabled, any bitmaps in the file are loaded using
+    the shared cache from XRCWidgets.bitmaps.  Plain files that contain
+    no bitmaps are loaded by name, so that wx resolves their relative
+    references; otherwise the rewritten data is loaded from memory, with
+    relative file names made absolute.
+    """
+    try:
+        return _xmlResources[fileNm]
+    except KeyError:
+        pass
+    isPlain = resources.isPlainFile(fileNm)
+    baseDir = None
+    if isPlain:
+        baseDir = os.path.dirname(os.path.abspath(fileNm))
+    (data,count) = bitmaps.rewriteBitmaps(resources.getData(fileNm),baseDir)
+    if isPlain and count == 0:
+        xrcres = xrc.XmlResource(fileNm)
+    else:
+        xrcres = xrc.EmptyXmlResource()
+        xrcres.LoadFromString(data)
+    _xmlResources[fileNm] = xrcres
+    return xrcres
+
+
+
+########
+##
+##  XRCWidget subclasses for specific Widgets
+##
+########
+
+
+class XRCPanel(XRCWidget,wx.Panel):
+    """wx.Panel with XRCWidget behaviors."""
+
+    def __init__(self,parent=NotGiven,id=-1,*args,**kwds):
+        XRCWidget.__init__(self,parent)
+
+    def _getPre(self):
+        return wx.PrePanel()
+
+    def _loadOn(self,XRCRes,pre,parent,nm):
+        return XRCRes.LoadOnPanel(pre,parent,nm)
+
+
+
+class XRCDialog(XRCWidget,wx.Dialog):
+    """wx.Dialog with XRCWidget behaviors."""
+
+    def __init__(self,parent=NotGiven,id=-1,title="Untitled Dialog",*args,**kwds):
+        XRCWidget.__init__(self,parent)
+
+    def _getPre(self):
+        return wx.PreDialog()
+
+    def ShowModal(self):
+        """Show the dialog modally, returning the code it was ended with.
+
+        A pooled dialog is returned to its pool once the caller has handled
+        the result, however the modal loop was ended, unless the caller has
+        shown it again by then.
+        """
+        result = wx.Dialog.ShowModal(self)
+        if self._widgetPool is not None:
+            wx.CallAfter(self._releaseAfterModal,self._poolReleases)
+        return result
+
+    def _loadOn(self,XRCRes,pre,parent,nm):
+        return XRCRes.LoadOnDialog(pre,parent,nm)
+
+
+
+class XRCFrame(XRCWidget,wx.Frame):
+    """wx.Frame with XRCWidget behaviors."""
+
+    def __init__(self,parent=NotGiven,id=-1,title="Untitled Frame",*args,**kwds):
+        XRCWidget.__init__(self,parent)
+
+    def _getPre(self):
+        return wx.PreFrame()
+
+    def _loadOn(self,XRCRes,pre,parent,nm):
+        return XRCRes.LoadOnFrame(pre,parent,nm)
+
+
+class XRCApp(XRCFrame):
+    """XRCFrame that can act as a standalone application.
+
+    This class provides a convient way to specify the main frame of
+    an application.  It is equivalent to an XRCFrame, but provides
+    the following additional methods:
+
+        * MainLoop/ExitMainLoop
+
+    It thus behaves as a simple combination of a wx.Frame and a wx.App, with
+    the frame coming from the XRC file and being the TopLevelWindow of
+    the application.  If a wx.App already exists it is used, otherwise a
+    new wx.PySimpleApp is created.  Applications with several top-level
+    frames should use XRCApplication instead.
+    """
+
+    def __init__(self,*args,**kwds):
+        parent = None
+        self.__app = wx.GetApp()
+        if self.__app is None:
+            self.__app = wx.PySimpleApp(0)
+        XRCFrame.__init__(self,parent,*args,**kwds)
+        self.__app.SetTopWindow(self)
+
+    def MainLoop(self):
+        self.Show()
+        self.__app.MainLoop()
+
+    def ExitMainLoop(self):
+        self.__app.ExitMainLoop()
+
+
+
+class XRCApplication(object):
+    """Application owning any number of top-level XRC frames.
+
+    This class wraps the wx.App, which is taken from wx.GetApp() if one
+    already exists and is otherwise created as a wx.PySimpleApp.  Frames
+    are opened using openFrame(), and are kept in a registry until they are
+    destroyed so they can be found with getFrames() and closed together
+    using closeAll().
+
+    All frames share the caches of XRC file locations, loaded resources,
+    indexes and magic methods, so only the first frame of each class does
+    this work.  It can be done ahead of time using preload().  When the
+    application is shut down these caches are cleared, along with any
+    pools of pre-built widgets.
+    """
+
+    def __init__(self,app=None):
+        if app is None:
+            app = wx.GetApp()
+        if app is None:
+            app = wx.PySimpleApp(0)
+        self.app = app
+        self._frames = []
+
+    def preload(self,*classes):
+        """Load the resources needed by the given classes ahead of time."""
+        for cls in classes:
+            cls.preload()
+
+    def openFrame(self,cls,*args,**kwds):
+        """Create and show a new top-level frame.
+
+        The frame is created by calling <cls>(None,*<args>,**<kwds>), and is
+        registered with the application until it is destroyed.  The first
+        frame opened becomes the application's top window.
+        """
+        frame = cls(None,*args,**kwds)
+        self.addFrame(frame)
+        frame.Show()
+        return frame
+
+    def addFrame(self,frame):
+        """Register a top-level window created elsewhere."""
+        if frame in self._frames:
+            return
+        self._frames.append(frame)
+        frame.Bind(wx.EVT_WINDOW_DESTROY,self._onFrameDestroy)
+        if self.app.GetTopWindow() is None:
+            self.app.SetTopWindow(frame)
+
+    def getFrames(self,cls=None):
+        """Get a list of the open frames, optionally only those of <cls>."""
+        self._frames = [f for f in self._frames if f]
+        if cls is None:
+            return list(self._frames)
+        return [f for f in self._frames if isinstance(f,cls)]
+
+    def closeAll(self,force=False):
+        """Close all open frames.
+
+        Each frame is sent a close event, which it may veto unless <force>
+        is true.  True is returned if every frame agreed to close.
+        """
+        closed = True
+        for frame in self.getFrames():
+            if not frame.Close(force):
+                closed = False
+        return closed
+
+    def shutdown(self,force=True):
+        """Close all frames and release the shared caches and pools.
+
+        If any frame vetoes being closed, nothing is released and False is
+        returned.  Otherwise the main loop is asked to exit.
+        """
+        if not self.closeAll(force):
+            return False
+        pool.unregisterAll()
+        memory.clearCaches()
+        self.app.ExitMainLoop()
+        return True
+
+    def MainLoop(self):
+        self.app.MainLoop()
+
+    def ExitMainLoop(self):
+        self.app.ExitMainLoop()
+
+    def _onFrameDestroy(self,evt):
+        # Destroy events propagate up from children, so check the source
+        evt.Skip()
+        frame = evt.GetEventObject()
+        if frame in self._frames:
+            self._frames.remove(frame)
+
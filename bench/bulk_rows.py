@@ -0,0 +1,110 @@
+"""
+
+    bench/bulk_rows.py:  Measure the time taken to create many XRCPanels
+
+A panel containing a few typical controls is created repeatedly inside a
+scrolled window, first one at a time and then using XRCPanel.createMany().
+For comparison, the same number of rows is then shown in an XRCRowList,
+which only creates panels for the rows that are visible.
+This requires wxPython and a display.  Run from the root of the distribution:
+
+    python bench/bulk_rows.py [rows]
+
+"""
+
+import sys
+import time
+
+import wx
+from XRCWidgets import XRCPanel, XRCRowList
+
+
+ROW_XRC = """<?xml version="1.0" ?>
+<resource>
+  <object class="wxPanel" name="RowPanel">
+    <object class="wxBoxSizer">
+      <orient>wxHORIZONTAL</orient>
+      <object class="sizeritem">
+        <object class="wxCheckBox" name="selected"/>
+      </object>
+      <object class="sizeritem">
+        <option>1</option>
+        <flag>wxEXPAND</flag>
+        <object class="wxTextCtrl" name="description"/>
+      </object>
+      <object class="sizeritem">
+        <object class="wxChoice" name="status">
+          <content>
+            <item>Open</item>
+            <item>Closed</item>
+          </content>
+        </object>
+      </object>
+      <object class="sizeritem">
+        <object class="wxButton" name="remove">
+          <label>Remove</label>
+        </object>
+      </object>
+    </object>
+  </object>
+</resource>
+"""
+
+
+class RowPanel(XRCPanel):
+    _xrcdata = ROW_XRC
+
+    def on_selected_change(self,ctrl):
+        pass
+
+    def on_description_change(self,ctrl):
+        pass
+
+    def on_remove_activate(self,ctrl):
+        pass
+
+
+def makeContainer(frame):
+    container = wx.ScrolledWindow(frame,-1)
+    container.SetSizer(wx.BoxSizer(wx.VERTICAL))
+    return container
+
+
+def run(rows=1000):
+    app = wx.PySimpleApp(0)
+    frame = wx.Frame(None,-1,"bulk_rows")
+    # Warm up the shared caches, as happens after the first window is built
+    RowPanel(makeContainer(frame))
+
+    container = makeContainer(frame)
+    sizer = container.GetSizer()
+    start = time.time()
+    for i in range(rows):
+        sizer.Add(RowPanel(container),0,wx.EXPAND)
+    container.Layout()
+    t = time.time() - start
+    sys.stdout.write("%-30s  %8.1f ms\n" % ("one at a time",t*1000))
+
+    container = makeContainer(frame)
+    start = time.time()
+    RowPanel.createMany(container,rows)
+    t = time.time() - start
+    sys.stdout.write("%-30s  %8.1f ms\n" % ("createMany()",t*1000))
+
+    source = [{"description": "Row %d" % (i,)} for i in range(rows)]
+    start = time.time()
+    rowList = XRCRowList(frame,RowPanel,size=(400,300))
+    rowList.SetSource(source)
+    t = time.time() - start
+    numPanels = len(rowList.GetChildren())
+    sys.stdout.write("%-30s  %8.1f ms  (%d panels)\n" % ("XRCRowList",
+                                                        t*1000,numPanels))
+    frame.Destroy()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run()
+
@@ -0,0 +1,64 @@
+"""
+
+    bench/import_time.py:  Measure the time taken to import XRCWidgets
+
+Each import is timed in a fresh interpreter, and the best of several runs
+is reported.  Run from the root of the distribution:
+
+    python bench/import_time.py [runs]
+
+"""
+
+import os
+import sys
+import subprocess
+
+
+# Statements to time, each executed in a new interpreter
+STATEMENTS = [
+  ("import XRCWidgets", "import XRCWidgets"),
+  ("import XRCWidgets.index", "import XRCWidgets.index"),
+  ("XRCWidgets.XRCWidget", "import XRCWidgets; XRCWidgets.XRCWidget"),
+]
+
+TIMER = """
+import time
+start = time.time()
+%s
+sys.stdout.write(repr(time.time() - start))
+"""
+
+
+def timeStatement(stmt,runs):
+    """Best time in seconds to execute <stmt> in a fresh interpreter."""
+    code = "import sys\n" + TIMER % (stmt,)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([os.getcwd()] + sys.path)
+    best = None
+    for i in range(runs):
+        proc = subprocess.Popen([sys.executable,"-c",code],env=env,
+                                stdout=subprocess.PIPE,stderr=subprocess.PIPE)
+        (out,err) = proc.communicate()
+        if proc.returncode != 0:
+            return None
+        t = float(out)
+        if best is None or t < best:
+            best = t
+    return best
+
+
+def run(runs=10):
+    for (desc,stmt) in STATEMENTS:
+        t = timeStatement(stmt,runs)
+        if t is None:
+            sys.stdout.write("%-30s  failed (is wxPython installed?)\n" % (desc,))
+        else:
+            sys.stdout.write("%-30s  %8.2f ms\n" % (desc,t*1000))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run()
+
@@ -0,0 +1,99 @@
+"""
+
+    bench/parsers.py:  Compare the XMLDocTree parsing backends
+
+A large XRC document is generated, containing many resources with long
+multi-line text nodes, and parsed with each available backend.  Building
+the XRCIndex of every resource is timed as well, as this is what the
+toolkit does with the tree.  wxPython is not required.  The XRCWidgets
+package in this distribution is used:
+
+    python bench/parsers.py [resources] [runs]
+
+Timings vary from run to run by more than the difference between the
+backends, so compare several runs before drawing conclusions.
+
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from XRCWidgets.utils import XMLDocTree, getXMLBackends
+from XRCWidgets.index import XRCIndex
+
+
+RESOURCE = """
+  <object class="wxPanel" name="Panel%(r)d">
+    <object class="wxFlexGridSizer">
+      <cols>2</cols>
+      <growablecols>1</growablecols>
+%(rows)s
+    </object>
+  </object>"""
+
+ROW = """
+      <object class="sizeritem">
+        <object class="wxStaticText" name="label_%(r)d_%(i)d">
+          <label>Field %(i)d</label>
+        </object>
+      </object>
+      <object class="sizeritem">
+        <flag>wxALL|wxEXPAND</flag>
+        <border>2</border>
+        <object class="wxTextCtrl" name="value_%(r)d_%(i)d">
+          <style>wxTE_MULTILINE</style>
+          <value>%(text)s</value>
+        </object>
+      </object>"""
+
+TEXT = "\n".join(["A long line of help text &amp; more, number %d" % (n,)
+                  for n in range(50)])
+
+
+def makeXRC(numResources,rowsPerResource=50):
+    """Generate an XRC document with the given number of resources."""
+    rsrcs = []
+    for r in range(numResources):
+        rows = [ROW % {"r": r, "i": i, "text": TEXT}
+                for i in range(rowsPerResource)]
+        rsrcs.append(RESOURCE % {"r": r, "rows": "".join(rows)})
+    xrc = '<?xml version="1.0" ?>\n<resource>%s\n</resource>\n'
+    return (xrc % ("".join(rsrcs),)).encode("utf-8")
+
+
+def timeBackend(backend,data,runs):
+    """Best times in seconds to parse <data>, and to parse and index it."""
+    bestParse = bestIndex = None
+    for i in range(runs):
+        start = time.time()
+        tree = XMLDocTree(BytesIO(data),backend)
+        parsed = time.time()
+        for rName in tree.elements:
+            if rName.startswith("Panel"):
+                XRCIndex(tree,rName)
+        indexed = time.time()
+        if bestParse is None or parsed - start < bestParse:
+            bestParse = parsed - start
+        if bestIndex is None or indexed - start < bestIndex:
+            bestIndex = indexed - start
+    return (bestParse,bestIndex)
+
+
+def run(numResources=20,runs=5):
+    data = makeXRC(numResources)
+    sys.stdout.write("%d resources, %.1f MB of XRC\n" % (numResources,
+                                                         len(data)/1e6))
+    sys.stdout.write("%-10s  %10s  %10s\n" % ("backend","parse","+index"))
+    for backend in getXMLBackends():
+        (tParse,tIndex) = timeBackend(backend,data,runs)
+        sys.stdout.write("%-10s  %7.1f ms  %7.1f ms\n" % (backend,
+                                                   tParse*1000,tIndex*1000))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,45 @@
+"""
+
+    bench/replay_events.py:  Replay recorded events into a top-level widget
+
+The events saved by XRCWidgets.replay are replayed into a new instance of
+the given XRCFrame or XRCDialog class, and the time taken by each handler
+is reported.  The class's module must be importable.  This requires
+wxPython and a display, which may be a virtual one such as Xvfb:
+
+    python bench/replay_events.py module.Class session.events [runs]
+
+"""
+
+import sys
+
+import wx
+from XRCWidgets import replay
+from XRCWidgets.utils import importClass
+
+
+def run(clsName,path,runs=1):
+    app = wx.PySimpleApp(0)
+    cls = importClass(clsName)
+    events = replay.loadEvents(path)
+    for i in range(runs):
+        replayer = replay.install()
+        widget = cls(None)
+        app.ProcessPendingEvents()
+        replay.uninstall()
+        replayer.replay(events)
+        sys.stdout.write("run %d: %d events\n" % (i+1,len(events)))
+        replayer.report(sys.stdout)
+        replayer.clear()
+        widget.Destroy()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.stderr.write(__doc__)
+        sys.exit(1)
+    runs = 1
+    if len(sys.argv) > 3:
+        runs = int(sys.argv[3])
+    run(sys.argv[1],sys.argv[2],runs)
+
@@ -4,6 +4,7 @@
 #
 
 from XRCWidgets import XRCApp, XRCDialog, XRCFrame, XRCPanel
+from XRCWidgets import pool
 
 
 
@@ -23,10 +24,13 @@ class MainFrame(XRCApp):
         # This is currently broken on my Linux machine...
         self.getChild("m_edit_reportcb").Check()
         self.getChild("m_edit_tb").Check()
+        # Build the popups while idle, so they appear instantly
+        pool.register(AboutDialog,args=(self,))
+        pool.register(ReportFrame,args=("",self))
 
     # Popup report frame showing message
     def report(self,msg):
-        frm = ReportFrame(msg,self)
+        frm = ReportFrame.acquire(msg)
         frm.Show()
 
     # Show a SelectPanel inside the desired panel
@@ -39,11 +43,11 @@ class MainFrame(XRCApp):
 
     # Popup the about dialog from the help menu item
     def on_m_help_about_activate(self,evt):
-        dlg = AboutDialog(self)
+        dlg = AboutDialog.acquire()
         dlg.ShowModal()
 
     def on_t_about_activate(self,evt):
-        dlg = AboutDialog(self)
+        dlg = AboutDialog.acquire()
         dlg.ShowModal()
 
     def on_t_report_activate(self,evt):
@@ -112,6 +116,10 @@ class ReportFrame(XRCFrame):
         XRCFrame.__init__(self,*args,**kwds)
         self.getChild("value_text").SetLabel(msg)
 
+    # Show a new message when handed out from the pool
+    def on_acquire(self,msg):
+        self.getChild("value_text").SetLabel(msg)
+
     def on_done_button_activate(self,evt):
         self.Destroy()
 
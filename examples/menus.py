@@ -2,25 +2,34 @@
 
 import wx
 from XRCWidgets import XRCApp
+import XRCWidgets.connectors
 
 
 class MenuApp(XRCApp):
 
+    numDocs = 0
+
     def on_m_file_exit_activate(self,ctrl):
         self.Close()
 
     def on_m_file_new_doc_activate(self,evt):
         print "NEW DOCUMENT"
+        self.numDocs += 1
 
     def on_m_file_new_tmpl_activate(self,evt):
         print "NEW TEMPLATE"
 
+    def on_m_file_new_tmpl_updateui(self,evt):
+        # Templates can only be made once there is a document
+        evt.Enable(self.numDocs > 0)
+
     def on_m_help_about_activate(self,evt):
         print "SHOWING ABOUT DIALOG..."
 
 
 
 def run():
+    XRCWidgets.connectors.configureUpdateUI(interval=250,specifiedOnly=True)
     app = MenuApp()
     app.MainLoop()
 